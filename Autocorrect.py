@@ -1,13 +1,84 @@
+import codecs
+import mmap
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from heapq import heappop, heappush
+
+
+#Header of the snapshot file written by Trie.save:
+#magic, version, byte order, ranking size, typecode of labels, number of nodes, edges, words,
+#bytes of string pool
+SNAPSHOT_HEADER = struct.Struct("<4sBBHcIIIQ")
+SNAPSHOT_MAGIC = b"TRIE"
+SNAPSHOT_VERSION = 2
+#Marks an empty entry in the word and ranking tables of the snapshot
+NO_WORD = 0xFFFFFFFF
+#Default size of the search cache with ranking_depth, whose searches resolve rankings of chains
+RANKING_CACHE_SIZE = 256
+
+
+def rank_key(node):
+    """
+    Function description:
+    Ordering key of a terminal node inside a ranking. A smaller key is a better word:
+    higher frequency first, then lower ascii value. Comparing the strings directly 
+    gives the ascii rule, including a shorter word before a longer word with the same prefix.
+
+    Input:  node(Node)
+
+    Ouput:  key(tuple of int and string)
+
+    Time Complexity:    O(1)
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(1)(Input) + O(1)
+    """
+    return (-node.freq, node.string)
+
+
 
 class Trie:
     """
     Class for Trie data structure
     """
-    def __init__(self):
+    #Methods that are wrapped by instrument, to count the work of the hot paths
+    COUNTED = ("add_child", "child", "walk", "update_ranking", "refill_ranking", "collect")
+    #Operations that are timed by the on_timing callback, insert and remove are timed as adjust
+    TIMED = ("adjust", "search", "search_many", "complete", "correct")
+
+    def __init__(self, k = 3, cache_size = None, concurrent = False, instrument = False, on_timing = None, lazy = False,
+                 ranking_depth = None):
         """
         Function description: Constructor of Trie class
 
-        Input:  None
+        Input:  
+        argument1: k(optional)(int), maximum number of words returned by search
+        argument2: cache_size(optional)(int), maximum number of search results kept in
+                   the least recently used cache, 0 disables the cache. By default, the
+                   cache holds RANKING_CACHE_SIZE results with ranking_depth outside of
+                   concurrent mode, and is disabled otherwise
+        argument3: concurrent(optional)(bool), if True, the Trie can be searched by many
+                   threads while another thread changes it, see adjust
+        argument4: instrument(optional)(bool), if True, count the work of the hot paths,
+                   see instrument and stats
+        argument5: on_timing(optional)(callable), called with (operation, key, seconds) 
+                   after every operation, see instrument
+        argument6: lazy(optional)(bool), if True, insert only marks the rankings on the
+                   path as dirty, and they are computed when search needs them, see 
+                   get_ranking
+        argument7: ranking_depth(optional)(int), if given, the rankings are only kept at
+                   nodes of this depth or less, at branching nodes and at terminal nodes
+                   with children, see keeps_ranking. This implies the lazy mode
 
         Ouput:  None
 
@@ -16,547 +87,4569 @@ class Trie:
         Auxiliary space Complexity:O(1)
         Space Complexity:   O(1)
         """
+        if(k < 1):
+            raise ValueError("k must be at least 1")
+        #The rankings are computed by search in lazy mode, so the readers would change the nodes
+        lazy = lazy or ranking_depth is not None
+        if(concurrent and lazy):
+            raise ValueError("the lazy mode can not be used in concurrent mode")
+        #The default cache is only used when the caller did not choose a size
+        if(cache_size is None):
+            cache_size = RANKING_CACHE_SIZE if ranking_depth is not None and not concurrent else 0
+        #The cache is changed by every search, so it can not be shared by the readers
+        if(concurrent and cache_size > 0):
+            raise ValueError("the search cache can not be used in concurrent mode")
+
         self.root = Node()
+        #Maximum size of every ranking
+        self.k = k
+        self.lazy = lazy
+        self.ranking_depth = ranking_depth
 
+        #Least recently used cache of search results, the oldest key is the first one
+        self.cache_size = cache_size
+        self.cache = OrderedDict() if cache_size > 0 else None
+        #The cached keys in sorted order, so the keys of a prefix are found by invalidate
+        self.cached_keys = KeyIndex() if cache_size > 0 else None
+        self.hits = 0
+        self.misses = 0
 
-    def insert(self, key):
+        #Lock of the writers in concurrent mode, the readers never take it
+        self.lock = threading.Lock() if concurrent else None
+
+        #Counters of the instrumentation, None when it is disabled
+        self.counters = None
+        if(instrument or on_timing is not None):
+            self.instrument(on_timing)
+
+
+    @classmethod
+    def from_counts(cls, mapping, **options):
         """
         Function description:
-        Inserting key to the Trie using tail recursion
+        Build a Trie from a pre-aggregated frequency table, such as a dictionary 
+        or collections.Counter that maps every word to the number of times it occurs.
+        
+        Instead of inserting every occurrence, each distinct word is walked once to
+        set its frequency, then the ranking of every node is computed in a single 
+        bottom-up pass by build_rankings. The result is the same as calling insert
+        freq times for every word. In lazy mode, the rankings are not computed until
+        search needs them.
 
-        Input:  key(string)
+        Input:  
+        argument1: mapping(dict of string to int)
+        argument2: options(optional), keyword arguments of the constructor
 
-        Ouput:  None
+        Ouput:  trie(Trie)
 
-        Time Complexity:    O(n), where n is the length of string
-        -Analysis:  The auxiliary function will call itself n times
+        Time Complexity:    O(N), where N is the total length of distinct words
+        -Analysis:  Each distinct word is walked once, and build_rankings 
+                    visits every node once.
 
-        Auxiliary space Complexity:   O(n), where n is the length of string
-        -Analysis:  The auxiliary function will call itself n times, so 
-                    n spaces are needed for the run stack.
+        Auxiliary space Complexity:   O(N), where N is the total length of distinct words
+        -Analysis:  At most N nodes are created.
 
-        Space Complexity: O(1)(Input) + O(n), where n is the length of string
+        Space Complexity: O(W)(Input) + O(N), where W is the size of the mapping
         """
-        self.insert_aux(self.root, key, 0)
+        trie = cls(**options)
+        for key, freq in mapping.items():
+            #Words that never occur are not part of the Trie
+            if(freq <= 0):
+                continue
+
+            current = trie.root
+            for char in key:
+                child = trie.child(current, char)
+                if(child is None):
+                    child = trie.add_child(current, char)
+                current = child
 
+            if(current.string is None):
+                current.string = key
+            current.freq += freq
 
-    def insert_aux(self, current, key, height):
+        if(not trie.lazy):
+            trie.build_rankings()
+        return trie
+
+
+    def build_rankings(self):
         """
         Function description:
-        Auxiliary function of insert function.
-        This function will create the Node if the Node does not exist.
-        When it reaches the end of the key, it will create the terminal node and return it.
-        When returning the terminal node, each node will decide to add the terminal node to their current ranking 
-        or update the ranking base on several criterias.
+        Compute the ranking of every node from the frequencies of the terminal nodes.
+        The nodes are collected in breadth first order, so looping through them 
+        backwards visits every child before its parent. The ranking of a node is the
+        top k of its own terminal node and the rankings of its children, which are
+        sorted by rank_key.
 
-        Input:
-        argument1:current(Node)
-        argument2:key(string)
-        argument3:height(int)
+        Same as insert, the root only has a ranking when the empty string is a word.
 
-        Ouput:  terminal_node(Node)
+        Input:  None
 
-        Time Complexity:    O(n), where n is the length of string
-        -Analysis:  It will call itself until height equals to length of string,
-                    so it will call itself O(n) times,
+        Ouput:  None
 
-        Auxiliary space Complexity:   O(n), where n is the length of string
-        -Analysis:  Since it will call itself n times, it will also take n
-                    spaces in the run stack.
+        Time Complexity:    O(N * k log k), where N is the number of nodes
+        -Analysis:  Each node is visited once, and each node sorts the rankings of
+                    its children, which have k pointers each.
 
-        Space Complexity: O(1)(Inputs) + O(n), where n is the length of string
+        Auxiliary space Complexity:   O(N), where N is the number of nodes
+        -Analysis:  The list of nodes in breadth first order takes N spaces.
+
+        Space Complexity: O(N)
         """
+        order = [self.root]
+        for current in order:
+            if(current.link is not None):
+                order.extend(current.link)
 
-        #Reach the end of the string
-        if(len(key) == height):
-            
-            #Create the terminal node if it is not existed
-            if(current.link[0] is None):
-                current.link[0] = Node()
-                current.link[0].string = key
-                current.link[0].height = height
+        #Only the nodes that keep their rankings, see keeps_ranking
+        if(self.ranking_depth is None):
+            self.compute_rankings(order[:0:-1])
+        else:
+            self.compute_rankings([current for current in order[:0:-1] if self.keeps_ranking(current)])
 
-            #Increase the frequency
-            current.link[0].freq += 1
-            #Update the ranking
-            self.update_ranking(current.link[0], current)
-            #Maintain the order of ranking
-            self.sorting(current)
+        if(self.root.string is not None):
+            self.root.ranking = [self.root]
 
-            return current.link[0]  #return the terminal node
-        
-        index = self.scale(key[height])
 
-        #Create the node
-        if(current.link[index] is None):
-            current.link[index] = Node()
-            current.link[index].height = height + 1
+    def compute_rankings(self, nodes):
+        """
+        Function description:
+        Compute the ranking of every node from its own terminal node and the rankings of 
+        its children, which are sorted by rank_key. Every child must come before its 
+        parent in nodes, or have its ranking already, or not keep its ranking.
+
+        Input:  nodes(iterable of Node)
 
-        current = current.link[index]
-        terminal_node = self.insert_aux(current, key, height + 1)
+        Ouput:  None
 
-        self.update_ranking(terminal_node, current)
-        self.sorting(current)
-        return terminal_node
-    
+        Time Complexity:    O(N * c * k log k), where N is the number of nodes and c is
+                            the maximum number of children of a node
+        -Analysis:  Each node sorts the rankings of its children, which have k pointers each.
 
-    def update_ranking(self, terminal_node, current):
+        Auxiliary space Complexity:   O(c * k)
+        -Analysis:  The candidates of a node.
+
+        Space Complexity: O(N)(Input) + O(c * k)
+        """
+        for current in nodes:
+            candidates = []
+            if(current.string is not None):
+                candidates.append(current)
+            if(current.link is not None):
+                for child in current.link:
+                    candidates.extend(child.ranking or self.get_ranking(child))
+            candidates.sort(key = rank_key)
+            current.ranking = candidates[:self.k]
+
+
+    def keeps_ranking(self, current):
         """
         Function description:
-        This function will update the current node's ranking.
+        Return whether the ranking of current is kept in the node. Without ranking_depth,
+        every node keeps its ranking. Otherwise only these nodes keep their rankings:
+        1. the nodes of depth ranking_depth or less, which are used by most searches
+        2. the branching nodes, whose rankings merge the rankings of the children
+        3. the terminal nodes with children, whose rankings add the node itself
+        Every other node is a leaf, whose ranking is only itself, or a node in a chain 
+        with a single child, whose ranking is the ranking of the child. Most nodes of a 
+        large Trie are of this kind, so their lists are not created.
 
-        Input: 
-        argument1: terminal_node(Node)
-        argument2: current(Node)
+        Input:  current(Node)
 
-        Ouput:  None
+        Ouput:  keeps(bool)
 
         Time Complexity:    O(1)
-        -Analysis:      
-                Since the maximum size of ranking is fixed, which is always less or equal to 3.
-                Therefore, the time complexity of looping through ranking is constant.
-                Besides that, time complexity of comparing the pointers to terminal_node is O(1) too.
-                Lastly,the function of comparing the ascii value has O(1) time complexity. 
-                Therefore, this entire function's time complexity is O(1).
 
         Auxiliary space Complexity:   O(1)
-        -Analysis: It does not create any lists or calling itself, so O(1)
 
-        Space Complexity: O(1)(Inputs) + O(1)
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return (self.ranking_depth is None or current.height <= self.ranking_depth or 
+                (current.link is not None and (len(current.link) > 1 or current.string is not None)))
+
+
+    def kept_node(self, current):
         """
+        Function description:
+        Walk down the chain of single children from current, until a node that keeps its
+        ranking or a leaf, which have the same ranking as current.
+
+        Input:  current(Node)
 
-        #Looping through the ranking using in keyword to check this is a new terminal node
-        if(terminal_node not in current.ranking):
+        Ouput:  node(Node)
 
-            #If the size of ranking is less than 3, 
-            #we can just add the terminal node to the ranking and sort it later
-            if(len(current.ranking) < 3):
-                current.ranking.append(terminal_node)
-                return 
-            
-            #If the ranking is full, we can just compare the last item of the ranking
-            #This is because the ranking is sorted, the last item always has the lowest frequency or highest ascii value
-            last_node = current.ranking[-1]
+        Time Complexity:    O(L), where L is the length of the chain
 
-            #New terminal node has higher frequency,so replace it
-            if(last_node.freq < terminal_node.freq):
-                current.ranking[-1] = terminal_node
-            
-            #Both has the same frequency, compare ascii value
-            elif(last_node.freq == terminal_node.freq):
-                bigger = self.compare_ascii(terminal_node, current.ranking[-1], current)
+        Auxiliary space Complexity:   O(1)
 
-                #If the last item has bigger ascii value, replace it.
-                if(bigger is current.ranking[-1]):
-                    current.ranking[-1] = terminal_node
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        while current.link is not None and not self.keeps_ranking(current):
+            current = current.link[0]
+        return current
 
 
-    def compare_ascii(self, terminal_node1, terminal_node2, current):
+    def get_ranking(self, current):
         """
         Function description:
-        Comparing the terminal node's string's ascii value, and return the terminal node with higher ascii value
+        Return the ranking of current. In lazy mode, a ranking that is None is dirty, 
+        which means a word below the node changed after the ranking was computed. The 
+        dirty nodes below current are collected, and their rankings are computed from the
+        bottom up, so the result is kept until the next change below the node. 
 
-        Input: 
-        argument1: terminal_node1(Node)
-        argument2: terminal_node2(Node)
-        argument3: current(Node)
+        When a node is marked dirty, all nodes above it are marked dirty too, so a node 
+        with a ranking only has nodes with rankings below it, and the collection stops 
+        at them. The ranking of the root is only the empty word, so it is not kept.
 
-        Ouput:  terminal_node, with higher ascii value
+        With ranking_depth, a node that does not keep its ranking takes the ranking of 
+        the node found by kept_node, and the chains below the dirty nodes are skipped 
+        in the same way, so only the nodes that keep their rankings are computed.
 
-        Time Complexity:    O(1)
-        -Analysis:  
-                   Since the maximum size of ranking is fixed, which is only 3.
-                   Looping through the ranking to check the pointer to
-                   terminal node or get the index of it takes constant time.
-                   Besides that, comparing two characters also takes constant time,
-                   therefore this function's time complexity is O(1).
+        Input:  current(Node)
 
-        Auxiliary space Complexity:   O(1)
-        -Analysis:
-                    It does not create any lists or call itself.
-        
-        Space Complexity: O(1)(Inputs) + O(1)
+        Ouput:  ranking(list of Node) or None
+
+        Time Complexity:    O(D * c * k log k), where D is the number of dirty nodes 
+                            below current, O(1) if current is not dirty
+
+        Auxiliary space Complexity:   O(D)
+        -Analysis:  The list of dirty nodes.
+
+        Space Complexity: O(1)(Input) + O(D)
         """
+        if(current.ranking is not None or not self.lazy):
+            return current.ranking
 
-        height = current.height 
+        if(current.height == 0):
+            return [current] if current.string is not None else None
 
-        #If the current's height equals to the length of terminal_node's string,
-        #means this current node's link[0] is this terminal node, which is shorter but has the same prefix
-        #This string has lower ascii value base on third criteria
-        if(height  == len(terminal_node1.string)):
-            return terminal_node2
-        elif(height == len(terminal_node2.string)):
-            return terminal_node1
+        #A leaf that does not keep its ranking only ranks itself
+        current = self.kept_node(current)
+        if(not self.keeps_ranking(current)):
+            return [current]
+        if(current.ranking is not None):
+            return current.ranking
 
-        #If both of them is longer than current's height, compare the character 
-        if(ord(terminal_node1.string[height]) > ord(terminal_node2.string[height])):
-            return terminal_node1
-        elif(ord(terminal_node1.string[height]) < ord(terminal_node2.string[height])):
-            return terminal_node2
+        order = [current]
+        for node in order:
+            if(node.link is not None):
+                for child in node.link:
+                    child = self.kept_node(child)
+                    if(child.ranking is None and self.keeps_ranking(child)):
+                        order.append(child)
 
-        #If both of them has the same character, we reuse the ranking of that character's node.
-        #For example, IDK, IDA, we are at I node. The height of I node is 1, but both of them string[1] are same, which is D.
-        #Therefore, we get the next node's ranking, which is D node, to know the order of this two strings.
-        
-        prev = current.link[self.scale(terminal_node1.string[height])]
-        
-        if(prev):
-            reused_ranking = prev.ranking
-            p1 = None #index of terminak_node1 in previous ranking
-            p2 = None #index of terminak_node1 in previous ranking
-
-            if(terminal_node1 in reused_ranking):
-                p1 = reused_ranking.index(terminal_node1)
-
-            if(terminal_node2 in reused_ranking):
-                p2 = reused_ranking.index(terminal_node2)
-            
-            #If both of them are inside the previous ranking
-            #Compare the index
-            if(p1 is not None and p2 is not None):
-                if(p1 > p2): #Bigger one means it has bigger ascii value or lesser frequency
-                    return terminal_node1
-                return terminal_node2
-            
-            #The one not inside the ranking means it is definitely not important.
-            elif(p1 is not None):
-                return terminal_node2
-            
-            elif(p2 is not None):
-                return terminal_node1
-        
+        self.compute_rankings(reversed(order))
+        return current.ranking
 
-    def sorting(self, current):
+
+    def insert(self, key):
         """
         Function description:
-        Sort the current node's ranking base on three criterias using buble sort
+        Inserting key to the Trie
 
-        Input: current(Node)
+        Input:  key(string)
 
         Ouput:  None
 
-        Time Complexity:    O(1)
-        -Analysis:
-                    Buble sort's time complexity is O(n^2), where n is the number
-                    of items. However, the maximum number of item in ranking
-                    is fixed, which is 3. Plus the time complexity of comparing two
-                    pointers takes constant time too. Therefore, this function's
-                    time complexity is O(1).
+        Time Complexity:    O(n), where n is the length of string
+        -Analysis:  The auxiliary function will loop through the key once and 
+                    update the rankings of the n nodes on the path.
 
-        Auxiliary space Complexity:   O(1)
-        -Analysis:  
-                    Buble sort does not create additional lists or call itself.
-        
-        Space Complexity: O(1)(Input) + O(1)
+        Auxiliary space Complexity:   O(n), where n is the length of string
+        -Analysis:  The auxiliary function keeps a stack of the n nodes on the path.
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of string
         """
-        done = False            #Indicating the ranking is sorted or not
-        rank = current.ranking
-        looping_limit = 0       #Prevent it from infinite loop, the maximum 
-                                # number of looping should be 9 
-
-        while not done and looping_limit < 10:    
-            done = True
-            looping_limit += 1
-
-            for i in range(len(rank)-1):
-                #Compare frequency
-                if(rank[i].freq < rank[i+1].freq):
-                    temp = rank[i]
-                    rank[i] = rank[i+1]
-                    rank[i+1] = temp
-                    done = False
-
-                #Same frequency, compare ascii value
-                elif(rank[i].freq == rank[i+1].freq):
-                    
-                    bigger = self.compare_ascii(rank[i], rank[i+1], current)
-                    
-                    if(bigger is rank[i]):
-                       
-                        temp = rank[i]
-                        rank[i] = rank[i+1]
-                        rank[i+1] = temp
-                        done = False
-    
-    def search(self, key):
+        self.adjust(key, 1)
+
+
+    def remove(self, key):
         """
         Function description:
-        This function will search through the Trie base on the key, and return
-        maximum top 3 words.
+        Remove the word key from the Trie, whatever its frequency is. The rankings on
+        the path are repaired and the nodes that have no word below them are removed.
 
-        Input: key(string)
+        Input:  key(string)
 
-        Ouput:  None
+        Ouput:  None, raises KeyError if key is not a word of the Trie
 
         Time Complexity:    O(n), where n is the length of key
-        -Analysis:  
-                    n is the length of key
+        -Analysis:  Same as adjust.
 
-                    1.Call the auxiliary function :                 O(n)
-                    2.Looping through lists and get top 3 words:    O(3)(max)
+        Auxiliary space Complexity:   O(n), where n is the length of key
 
-                    Total: O(n) + O(3) = O(n)
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
+        """
+        freq = self.frequency(key)
+        if(freq == 0):
+            raise KeyError(key)
+        self.adjust(key, -freq)
 
-        Auxiliary space Complexityy:   O(n), where n is the length of key
-        -Analysis:
-                    n is the length of key
 
-                    1.Auxiliary function calls itself:          O(n)
-                    2.Get the top 3 words                       O(3)(max)
+    def adjust(self, key, delta):
+        """
+        Function description:
+        Change the frequency of the word key by delta. A positive delta works like 
+        inserting key delta times. A negative delta lowers the frequency, and the word is
+        removed when its frequency is not positive anymore. The result is the same as 
+        building the Trie again from the new frequencies.
+
+        When the cache is used, the states of the path before and after the change are 
+        compared, and the cached results of keys that start with the prefix of the first 
+        changed node are removed. In lazy mode, the results of the keys that start with 
+        the first character of key are removed.
 
-                    Total: O(n) + O(3) = O(n)
+        In concurrent mode, the nodes that are published are never changed. The writer
+        takes the lock, copies the existing nodes on the path of key with copy_path, and 
+        changes the copies only. The new root is then published with a single assignment,
+        so a reader that took the old root keeps a complete old version of the Trie, and 
+        a reader that takes the new root sees the whole change.
 
-        Space Complexity: O(1)(Input) + O(n), where n is the length of key        
+        Input: 
+        argument1: key(string)
+        argument2: delta(int)
+
+        Ouput:  None, raises KeyError if delta is negative and key is not a word of the Trie
+
+        Time Complexity:    O(n), where n is the length of key
+        -Analysis:  The auxiliary functions loop through the n nodes of the path, and 
+                    repairing the ranking of a node takes O(log k) time, or O(c * k) for 
+                    refill_ranking when a full ranking loses a word, where c is the number 
+                    of children. Copying the path in concurrent mode takes O(c + k) per node.
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+        -Analysis:  The auxiliary functions keep a stack of the n nodes on the path, and
+                    the concurrent mode creates n copies of nodes.
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
         """
-        result = self.search_aux(self.root, key, [])
-        if(result):
-            for i in range(len(result)):
-                result[i] = result[i].string
-            return result
-        return []
-    
-    def search_aux(self, current, key, lst):
+        if(delta == 0):
+            return
+
+        if(self.lock is not None):
+            with self.lock:
+                root = self.copy_path(key)
+                if(delta > 0):
+                    self.insert_aux(root, key, 0, delta)
+                else:
+                    self.decrease_aux(root, key, -delta)
+                #Publishing the new version
+                self.root = root
+            return
+
+        if(self.cache is not None and not self.lazy):
+            before = self.path_state(key)
+
+        if(delta > 0):
+            self.insert_aux(self.root, key, 0, delta)
+        else:
+            self.decrease_aux(self.root, key, -delta)
+
+        #The rankings are not kept on every node in lazy mode, so the results of every 
+        #key that shares the first node with key are removed
+        if(self.cache is not None and self.lazy):
+            self.invalidate(key[:1])
+
+        elif(self.cache is not None):
+            after = self.path_state(key)
+            depth = 0
+            while depth < min(len(before), len(after)) and before[depth] == after[depth]:
+                depth += 1
+            if(depth < max(len(before), len(after))):
+                self.invalidate(key[:depth])
+
+
+    def frequency(self, key):
         """
         Function description:
-        The auxiliary function of search function. This function will call itself
-        several times base on the key's valid part,then return a list that 
-        contains maximum top 3 words.
+        Return the frequency of the word key, or 0 if key is not a word of the Trie.
 
-        Input: 
-        argument1: current(Node)
-        argument2: key(string)
-        argument3: lst(list)
+        Input:  key(string)
 
-        Ouput:  lst(list)
+        Ouput:  frequency(int)
 
         Time Complexity:    O(n), where n is the length of key
-        -Analysis:  In worst case scenario, the key is existed in the trie, so 
-                    we need to loop through the key to reach terminal node, which
-                    means this function will call itself n times, where n is the 
-                    length of string
 
         Auxiliary space Complexity:   O(n), where n is the length of key
-        -Analysis:  Same as before, if the key is existed in the trie. This function
-                    will call itself n times, so this function needs n spaces in the run stack
-        
-        Space Complexity: O(1)(Inputs) + O(n)
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
         """
+        root = self.root
+        path = self.walk(key, root)
+        if(len(path) != len(key)):
+            return 0
+        return path[-1].freq if path else root.freq
 
-        #While searching, if we found that the node is not existed, we can 
-        #focus on getting the top 3 words
-        if(current is None):
-            return lst
 
-        #If we reach the end of string, we check index 0 of the link.
-        #If it is not none, means this word is existed, so we can return empty list
-        #Else we need to get the top 3 words.
-        if(len(key) == current.height):
-            if(current.link[0] is None):
-                return current.ranking
-            return None
+    def copy_path(self, key):
+        """
+        Function description:
+        Copy the root and the existing nodes on the path of key, and return the copy of 
+        the root. Every copied node is linked by the copy of its parent, and the rest of 
+        the nodes are shared with the current version, so the copies can be changed 
+        without changing the current version.
 
-        #Get the index of next node
-        index = self.scale(key[current.height])
+        Input:  key(string)
 
-        #If the first character of string does not existed, we return empty list
-        if(current is self.root and current.link[index] is None):
-            return None
-        
-        lst = self.search_aux(current.link[index], key, lst)
-        
-        if(current is not self.root and lst is not None):
-            if(len(lst) < 3):#Ensure the maximym size of returning list is 3
-                for i in current.ranking:
-                    #Only add the new pointers
-                    if(i not in lst and len(lst) < 3):
-                        lst.append(i) 
-        return lst       
-    
-        
-    def scale(self, char):
+        Ouput:  root(Node)
+
+        Time Complexity:    O(n * (c + k)), where n is the length of key and c is the 
+                            maximum number of children of a node
+        -Analysis:  Copying a node copies its list of children and its ranking, which
+                    have c and k pointers.
+
+        Auxiliary space Complexity:   O(n * (c + k)), where n is the length of key
+        -Analysis:  n + 1 nodes are copied.
+
+        Space Complexity: O(1)(Input) + O(n * (c + k))
+        """
+        root = self.root.copy()
+        current = root
+        for char in key:
+            index = current.chars.find(char)
+            if(index < 0):
+                break
+            #The list of children of current is a copy already
+            current.link[index] = current.link[index].copy()
+            current = current.link[index]
+        return root
+
+
+    def path_state(self, key):
         """
         Function description:
-        This function will convert the input into integer.The integer will be 
-        inside the range [0, 62].
+        Return the state of every existing node on the path of key, starting from the
+        root. The state of a node is its ranking and whether it is a terminal node, 
+        which are the only things that search reads from the node.
 
-        Input: char(character)
+        Input:  key(string)
 
-        Ouput:  index(int)
+        Ouput:  states(list of tuples)
 
-        Time Complexity:    O(1)
-        -Analysis:  This time complexity of checking the char(isdigit, isupper)
-                    takes constant time.
-                    Getting the ascii value of char(ord) also takes constant time
-                    ,plus time complexity of arithmetic operation(+,-) is O(1).
-                    Therefore, the time complexity of this function is O(1).
+        Time Complexity:    O(n), where n is the length of key
 
-        Auxiliary space Complexity:   O(1)
-        -Analysis: This function does not create any lists or call itself
+        Auxiliary space Complexity:   O(n), where n is the length of key
 
-        Space Complexity: O(1)(Input) + O(1)
+        Space Complexity: O(1)(Input) + O(n)
         """
-        #Digit
-        if(char.isdigit()):
-            return int(char) + 1
-        #Uppercase
-        if(char.isupper()):
-            return ord(char) - 54
-        #Lowercase
-        return ord(char) - 60
-    
+        current = self.root
+        states = []
+        for depth in range(len(key) + 1):
+            states.append((tuple(current.ranking or ()), current.string is not None))
+            if(depth == len(key)):
+                break
+            current = self.child(current, key[depth])
+            if(current is None):
+                break
+        return states
 
-class Node:
-    """
-    Class for Node of Trie
-    """
-    def __init__(self, size = 63):
+
+    def invalidate(self, prefix):
         """
-        Function description: Constructor of Node class
+        Function description:
+        Remove the cached results of every key that starts with prefix. 
+        
+        The result of a key only depends on the nodes on its path, so when the node of
+        prefix is the first node that is changed by an update, only the keys starting
+        with prefix can have a different result.
 
-        Input:  size(optional)(int)
+        Input:  prefix(string)
 
         Ouput:  None
 
-        Time Complexity:    O(n), where n is the size
-        -Analysis: Creating the link array takes n times, where n is the size
+        Time Complexity:    O(log C + R), where C is the cache size and R is the number
+                            of results removed
+        -Analysis:  Same as KeyIndex.pop_prefix.
 
-        Auxiliary space Complexity:  O(n), where n is the size
-        -Analysis: Creating the link array takes n spaces, where n is the size
+        Auxiliary space Complexity:   O(R)
 
-        Space Complexity:   O(1)(Input) + O(n)
+        Space Complexity: O(1)(Input) + O(R)
         """
-        self.link = [None]*size
-        self.freq = 0
-        #Store maximum 3 pointers
-        self.ranking = []
-        self.string = None
-        self.height = 0
-        #self.terminal_node = None
-      
-    
-class SpellChecker:
-    """
-    Class of SpellChecker 
-    """
-    def __init__(self, file_name):
+        if(self.cache is None):
+            return
+        if(prefix == ""):
+            self.cache.clear()
+            self.cached_keys = KeyIndex()
+            return
+        for key in self.cached_keys.pop_prefix(prefix):
+            del self.cache[key]
+
+
+    def cache_info(self):
         """
-        Function description: Constructor of SpellChecker class
+        Function description:
+        Return the counters of the search cache.
+
+        Input:  None
+
+        Ouput:  info(dict), with the hits, misses, current size and maximum size
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.cache) if self.cache is not None else 0, 
+                "capacity": self.cache_size}
+
+
+    def instrument(self, on_timing = None):
+        """
+        Function description:
+        Enable the instrumentation of the Trie. The methods in COUNTED are replaced by 
+        wrappers on this object, which count:
+        1. nodes_created:       nodes added by insert or from_counts
+        2. nodes_visited:       nodes reached by walk and child, and walks, the number 
+                                of walks
+        3. ranking_updates:     calls of update_ranking, and ranking_changes, the 
+                                calls that changed the ranking
+        4. ranking_refills:     full rankings that lost a word and were filled from the
+                                rankings of the children
+        5. searches:            results built by collect, and fallbacks, the results that
+                                needed the rankings of nodes above the deepest node
+        If on_timing is given, the operations in TIMED are also wrapped, and on_timing is 
+        called with the name of the operation, its first argument and the seconds it took.
+
+        The wrappers are attributes of this object, and the class is not changed, so a
+        Trie without instrumentation runs exactly the same code as before. The counters
+        are not locked, so they are approximate when many threads use the Trie.
 
-        Input:  file_name(string)
+        Input:  on_timing(optional)(callable)
 
         Ouput:  None
 
-        Time complexity: O(T), where T is the number of characters of the file
-        -Analysis:  T is the number of character of the file
+        Time Complexity:    O(1)
 
-                    Each word will be looped through 3 times.
-                    1. Adding it to the word list
-                    2. Using join function 
-                    3. Insert the word to the trie
+        Auxiliary space Complexity:   O(1)
 
-                In worst case,if the file only has one word, all the characters of the file will be looped through 3 times,
-                so the time complexity is O(3T), which is O(T) 
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        self.uninstrument()
+        counters = self.counters = Counter()
 
-        Auxiliary Space Complexity: O(T), where T is the number of character of the file.
-        -Analysis:  In worst case, there is only one word in the file so the word list will
-                    take T spaces to create the word, using join function will create a string that 
-                    takes T spaces.After that, inserting it to the trie needs T nodes.
+        for name in self.COUNTED:
+            setattr(self, name, counting(name, getattr(self, name), counters, self))
 
-                    Overall, its auxiliary space complexity is O(T), where T is the number of character of the file.
+        if(on_timing is not None):
+            for name in self.TIMED:
+                setattr(self, name, timing(name, getattr(self, name), on_timing))
 
-        Space Complexity: O(1)(Input) + O(T), where T is the number of character of the file.
 
+    def uninstrument(self):
         """
-        #Creating the Trie 
-        self.trie = Trie() 
-        file = open(file_name, "r")
+        Function description:
+        Disable the instrumentation, the wrappers are removed and the class methods 
+        are used again.
 
-        #Looping through each line of the file
-        for line in file:
+        Input:  None
 
-            word = []
+        Ouput:  None
 
-            #Looping through every character of the line
-            for letter in range(len(line.strip())):
+        Time Complexity:    O(1)
 
-                #If it is a valid character, add it to list
-                if(line[letter].isalpha() or line[letter].isdigit()):
-                    word.append(line[letter])
+        Auxiliary space Complexity:   O(1)
 
-                #If we encounter invalid character, we insert the accumulated character
-                # to the trie    
-                elif(len(word) != 0):
-                    self.trie.insert("".join(word))
-                    word = []
+        Space Complexity: O(1)
+        """
+        for name in self.COUNTED + self.TIMED:
+            self.__dict__.pop(name, None)
+        self.counters = None
 
-            if(len(word) != 0):
-                self.trie.insert("".join(word))
-        #Close the file        
-        file.close()
-                   
-                    
-    def check(self, key):
+
+    def stats(self):
         """
-        Function description: 
-        This function will take a key as argument and search through the Trie.After that,
-        it will return a list that contains maximum 3 words that meets some criterias or 
-        an empty list.
-        
-        Approach description:
-        We decide to add an attribute to the Node, which is a list(I call it ranking) that contains maximum 3 words base on 3 criterias.
-        Therefore, we can get the top 3 words easily when we are searching for it, do not need to traverse the entire trie.
+        Function description:
+        Return a snapshot of the counters of the instrumentation, with the mean number 
+        of nodes visited by a walk, or an empty dictionary if it is disabled.
 
-        When we are reading the file, we insert the words to our trie using recursion. The benefit of recursion is it can return something.
-        In this case, we want it to return a pointer to the terminal node. The reason we want the pointer to terminal node instead of word itself, is 
-        the space complexity of the pointer is O(1), unlike word will take n spaces, where n is the length of word. Besides that, terminal node
-        can store more information, such as the frequency, which we cannot know from the word. Therefore, it is logical to store the pointer to the
-        terminal node inside the ranking. Besides that, each node has an attribute called height, so we can know the index of characters we should compare 
-        at that node.
+        Input:  None
 
-        When we are returning the pointer to terminal node, each node will compare this pointer to those pointer(s) inside the ranking. However, we can compare 
-        this new pointer to the last pointer of the ranking because the ranking will maintain order. The last pointer is the worst among all 3 pointers. 
-        In other word, if the new pointer is worse than the last pointer of the ranking, it is also worse that the other pointers. The way of comparing two pointers
-        are comparing the frequency then the ascii value.Time compexity of comparing the frequency takes constant time, so we do not need to worry. The problem is the
-        ascii value. We can know that the index of that character we should compare for two pointers, but there is a scenario that both of them share a long common prefix.
-        For example, abbbbba, abbbbbb, and now we are at the first b node. We cannot continue comparing until the last character because the time complexity is not O(1) anymore.
-        To solve this problem, we decide to reuse the ranking of previous node. We use in keyword to check the position of both pointers of the previous ranking, it will take constant
-        time since the maximum size of ranking is fixed. After that, we compare their position, if one of their poisitions is none, means that pointer is worse. However, if both of
-        their positions are not none, we compare the index, the bigger index means it is worse.
+        Ouput:  stats(dict of string to number)
 
-        After update the ranking,
-        we need to maintain the order,so we sort the pointer using buble sort. The reason of using buble sort is it is inplace, no additional spaces required.
-        Besides that, since the maximum size of ranking is fixed, which is always 3, so the worst case of buble sort now become O(1) too. 
+        Time Complexity:    O(1)
 
-        This process will make our searching easier. Because we just need to search until the end of key or encounter the node does not exist, we just get the current node's ranking
-        as the returning list and returning back. If the returning list's size is lesser than 3, we get the pointers from the nearer node's ranking until it is full.
+        Auxiliary space Complexity:   O(1)
 
-        After that, we use a for-loop, to change the pointer to the word they stored and return this list of strings.
+        Space Complexity: O(1)
+        """
+        if(self.counters is None):
+            return {}
 
-        Input:  key(string)
+        stats = dict(self.counters)
+        stats["nodes_per_walk"] = stats.get("nodes_visited", 0) / stats["walks"] if stats.get("walks") else 0
+        return stats
 
-        Ouput:  empty list or a list with maximum 3 strings
 
-        Time complexity: O(M), where M is the length of key
-        -Analysis:  In worst case, the key is inside the Trie, so we need to 
-                    search until the end of key.
+    def remember(self, key, result):
+        """
+        Function description:
+        Store the result of key in the search cache, and remove the least recently 
+        used result when the cache is full.
 
-                    M is the length of key
-                    1. Using strip to check key is empty or not:      O(M)
-                    2. Using search function of trie:                 O(M)
+        Input: 
+        argument1: key(string)
+        argument2: result(list of strings)
 
-                    Total: O(M) + O(M)  = O(2M)
-                                        = O(M)
-                        
-        Auxiliary Space Complexity: O(M), where M is the length of key
-        -Analysis:  Same as before, the worst case is the key is inside the Trie,
-                    so the the auxiliary search function will call itself M times,
-                    the calling of this function needs M spaces in run stack.
+        Ouput:  None
 
-        Space Complexity:O(1)(Input) + O(M), where M is the length of key
+        Time Complexity:    O(log C), where C is the cache size
+        -Analysis:  The key is added to the index of the cached keys, see KeyIndex.add.
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Inputs) + O(1)
         """
-        if(key.strip() == ""):
-            return []
+        if(key not in self.cache):
+            self.cached_keys.add(key)
+        self.cache[key] = tuple(result)
+        if(len(self.cache) > self.cache_size):
+            oldest, _ = self.cache.popitem(last = False)
+            self.cached_keys.discard(oldest)
 
-        checking = self.trie.search(key) 
 
-        return checking
\ No newline at end of file
+    def insert_aux(self, current, key, height, count = 1):
+        """
+        Function description:
+        Auxiliary function of insert and adjust function.
+        This function will walk down from current and create the Node if the Node does not exist,
+        pushing every node to a stack of the path. When it reaches the end of the key, the node 
+        itself becomes the terminal node. After that, the stack is popped from the terminal node 
+        back to the first node, and each node will decide to add the terminal node to their current 
+        ranking or update the ranking base on several criterias.
+
+        The loop replaces the recursion, so there is no limit on the length of the key.
+
+        Input:
+        argument1:current(Node)
+        argument2:key(string)
+        argument3:height(int)
+        argument4:count(optional)(int), the increase of the frequency
+
+        Ouput:  terminal_node(Node)
+
+        Time Complexity:    O(n), where n is the length of string
+        -Analysis:  It will loop until height equals to length of string, then
+                    loop through the n nodes of the path again.
+
+        Auxiliary space Complexity:   O(n), where n is the length of string
+        -Analysis:  The stack of the path takes n spaces.
+
+        Space Complexity: O(1)(Inputs) + O(n), where n is the length of string
+        """
+        path = [current]
+
+        #Create the nodes until the end of the string
+        while height < len(key):
+            index = current.chars.find(key[height])
+            if(index < 0):
+                current = self.add_child(current, key[height])
+            else:
+                current = current.link[index]
+            path.append(current)
+            height += 1
+
+        #The node at the end of the key becomes the terminal node
+        terminal_node = current
+        if(terminal_node.string is None):
+            terminal_node.string = key
+
+        #Increase the frequency, the previous key is needed to find it inside the rankings
+        previous = rank_key(terminal_node)
+        terminal_node.freq += count
+
+        #Marking the path dirty, the root is never dirty
+        if(self.lazy):
+            for current in path[1:]:
+                current.ranking = None
+            return terminal_node
+
+        #Update the ranking from the terminal node back to the first node, the node where
+        #the walk started is only updated when it is the terminal node
+        for current in reversed(path[1:] or path):
+            self.update_ranking(terminal_node, current, previous)
+
+        return terminal_node
+
+
+    def decrease_aux(self, current, key, amount):
+        """
+        Function description:
+        Auxiliary function of adjust function for a negative delta.
+        This function will lower the frequency of the terminal node of key, or remove the
+        word when the frequency is not positive anymore. After that, the path is looped 
+        through from the terminal node back to the first node. A node without children that
+        is not a terminal node is removed from its parent, otherwise its ranking is 
+        repaired by update_ranking, or marked dirty in lazy mode.
+
+        Input:
+        argument1:current(Node), the root of the version that is changed
+        argument2:key(string)
+        argument3:amount(int), the decrease of the frequency
+
+        Ouput:  None, raises KeyError if key is not a word of the Trie
+
+        Time Complexity:    O(n), where n is the length of string
+        -Analysis:  Each node of the path is visited once.
+
+        Auxiliary space Complexity:   O(n), where n is the length of string
+        -Analysis:  The path takes n spaces.
+
+        Space Complexity: O(1)(Inputs) + O(n), where n is the length of string
+        """
+        path = [current] + self.walk(key, current)
+        terminal_node = path[-1]
+        if(len(path) != len(key) + 1 or terminal_node.string is None):
+            raise KeyError(key)
+
+        previous = rank_key(terminal_node)
+        if(terminal_node.freq > amount):
+            terminal_node.freq -= amount
+        else:
+            #The node is not a terminal node anymore
+            terminal_node.freq = 0
+            terminal_node.string = None
+
+        #The node where the walk started is only updated when it is the terminal node
+        for height in range(len(path) - 1, 0 if len(path) > 1 else -1, -1):
+            current = path[height]
+
+            #Removing the node that has no word below it
+            if(height > 0 and current.string is None and current.link is None):
+                self.remove_child(path[height - 1], key[height - 1])
+                continue
+
+            if(self.lazy):
+                if(height > 0):
+                    current.ranking = None
+                continue
+
+            self.update_ranking(terminal_node, current, previous)
+    
+
+    def update_ranking(self, terminal_node, current, previous):
+        """
+        Function description:
+        This function will update the current node's ranking after the frequency of
+        terminal_node is changed, or after terminal_node is removed.
+
+        The ranking is always sorted by rank_key, so binary search is used instead of 
+        looping through the ranking. The items are compared by their strings instead of 
+        their identities, because in concurrent mode the ranking may still point to an
+        older copy of the terminal node. If the terminal node is the first item and is 
+        still better than the second item, only the pointer is replaced. Otherwise:
+        1. The terminal node is found at the position of its previous key. If it is
+           inside the ranking, it is removed. If the ranking was full and the terminal 
+           node was removed or became worse than the rest of the ranking, a word outside
+           the ranking may be better now, so refill_ranking fills the empty place.
+        2. Otherwise, if the ranking is full, the terminal node is only added if it is
+           better than the last item, which is the worst item of the ranking. The last 
+           item is removed.
+        3. The terminal node is inserted at the position of its new key.
+
+        Input: 
+        argument1: terminal_node(Node)
+        argument2: current(Node)
+        argument3: previous(tuple), rank_key of terminal_node before the change
+
+        Ouput:  None
+
+        Time Complexity:    O(log k), where k is the maximum size of ranking
+        -Analysis:  Both binary searches compare O(log k) keys. Removing and inserting
+                    in a list of size k moves at most k pointers, which is a single 
+                    memory move, so comparisons dominate.
+
+        Auxiliary space Complexity:   O(1)
+        -Analysis: It does not create any lists or calling itself, so O(1)
+
+        Space Complexity: O(1)(Inputs) + O(1)
+        """
+        ranking = current.ranking
+        removed = terminal_node.string is None
+
+        #The ranking list is only allocated when the first terminal node reaches this node
+        if(ranking is None):
+            if(not removed):
+                current.ranking = [terminal_node]
+            return
+
+        #The terminal node is already the best item and stays the best item, a single
+        #item in a full ranking stays only if it is not worse than before
+        word = previous[1]
+        if(not removed and (ranking[0] is terminal_node or ranking[0].string == word) and 
+           (rank_key(terminal_node) < rank_key(ranking[1]) if len(ranking) > 1 else 
+            self.k > 1 or rank_key(terminal_node) < previous)):
+            ranking[0] = terminal_node
+            return
+
+        #The ranking is still sorted by the previous key of the terminal node
+        def old_key(node):
+            return previous if node is terminal_node or node.string == word else rank_key(node)
+
+        position = bisect_left(ranking, previous, key = old_key)
+        if(position < len(ranking) and old_key(ranking[position]) is previous):
+            del ranking[position]
+
+            #The ranking was full and the terminal node became worse, so the best word 
+            #outside the ranking may be better now
+            if(len(ranking) == self.k - 1 and (removed or (rank_key(terminal_node) > previous and 
+               (len(ranking) == 0 or rank_key(terminal_node) > rank_key(ranking[-1]))))):
+                self.refill_ranking(current)
+                return
+            if(removed):
+                if(len(ranking) == 0):
+                    current.ranking = None
+                return
+
+        elif(removed):
+            return
+
+        elif(len(ranking) == self.k):
+            #The new terminal node is not better than the worst item of the ranking
+            if(rank_key(terminal_node) >= rank_key(ranking[-1])):
+                return
+            ranking.pop()
+
+        insort(ranking, terminal_node, key = rank_key)
+
+
+    def refill_ranking(self, current):
+        """
+        Function description:
+        Add the best word of the subtree of current that is not inside its ranking, after
+        one word is removed from the full ranking. The best word outside the ranking is
+        always inside the ranking of one of the children, or it is the terminal node of
+        current itself, because a child ranking can not have k words that are better than 
+        it and also inside the ranking of current, which only has k - 1 words.
+
+        The rankings of the children must be correct already. The root only ranks the 
+        empty word, so its children are skipped.
+
+        Input:  current(Node)
+
+        Ouput:  None
+
+        Time Complexity:    O(c * k), where c is the number of children of current
+        -Analysis:  Each child has at most k pointers in its ranking.
+
+        Auxiliary space Complexity:   O(k)
+        -Analysis:  The strings of the ranking are kept in a set.
+
+        Space Complexity: O(1)(Input) + O(k)
+        """
+        ranked = set(node.string for node in current.ranking)
+        best = None
+        if(current.string is not None and current.string not in ranked):
+            best = current
+
+        for child in (current.link if current.height > 0 else None) or []:
+            for node in child.ranking:
+                if(node.string not in ranked and (best is None or rank_key(node) < rank_key(best))):
+                    best = node
+                    #The ranking of the child is sorted, so the rest of it is worse
+                    break
+
+        if(best is not None):
+            insort(current.ranking, best, key = rank_key)
+        elif(len(current.ranking) == 0):
+            current.ranking = None
+
+    
+    def search(self, key):
+        """
+        Function description:
+        This function will search through the Trie base on the key, and return
+        maximum top k words.
+
+        Input: key(string)
+
+        Ouput:  None
+
+        Time Complexity:    O(n), where n is the length of key
+        -Analysis:  
+                    n is the length of key
+
+                    1.Walk down the path of the key :               O(n)
+                    2.Looping through lists and get top k words:    O(k)(max)
+
+                    Total: O(n) + O(k) = O(n + k)
+
+        Auxiliary space Complexityy:   O(n), where n is the length of key
+        -Analysis:
+                    n is the length of key
+
+                    1.The path of the key:                      O(n)
+                    2.Get the top k words                       O(k)(max)
+
+                    Total: O(n) + O(k) = O(n + k)
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key        
+        """
+        #Repeated keys are answered from the cache
+        if(self.cache is not None):
+            cached = self.cache.get(key)
+            if(cached is not None):
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return list(cached)
+            self.misses += 1
+
+        #The root is only read once, so a concurrent change is either seen completely or not at all
+        root = self.root
+        result = self.collect(self.walk(key, root), key, root)
+
+        if(self.cache is not None):
+            self.remember(key, result)
+        return result
+
+
+    def complete(self, key):
+        """
+        Function description:
+        Return the k most frequent words that start with key, including key itself if
+        it is a word, which is the ranking of the node of key. Unlike search, the words 
+        of the shorter prefixes are not used. Only the empty key uses the ranking of 
+        the root, same as search.
+
+        Input: key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n + k), where n is the length of key
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+        -Analysis:  The path of the key is stored.
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
+        """
+        root = self.root
+        path = self.walk(key, root)
+        if(len(path) != len(key)):
+            return []
+
+        end = path[-1] if path else root
+        return [node.string for node in self.get_ranking(end) or []]
+
+
+    def complete_many(self, keys):
+        """
+        Function description:
+        Return the result of complete for every key, in the same order as the keys. 
+        Same as search_many, the keys are walked by prefix_walk.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K log K * M + K * k), where K is the number of keys and M 
+                            is the maximum length of key
+
+        Auxiliary space Complexity:   O(K + M)
+
+        Space Complexity: O(K * M)(Input) + O(K + M)
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        root = self.root
+
+        for position, path in prefix_walk(keys, root, self.child):
+            if(len(path) != len(keys[position])):
+                results[position] = []
+            else:
+                results[position] = [node.string for node in self.get_ranking(path[-1] if path else root) or []]
+
+        return results
+
+
+    def iter_prefix(self, prefix, order = "rank"):
+        """
+        Function description:
+        Return an iterator over every word that starts with prefix, including prefix 
+        itself if it is a word. Unlike complete, the words are not limited to k, and 
+        they are only found when the iterator is advanced, so taking the first N words
+        does not depend on the size of the subtree. This is used to page through the
+        suggestions, e.g. with itertools.islice.
+
+        The order is one of:
+        1. "rank": same order as the rankings, higher frequency first, then lower ascii
+           value, see iter_rank
+        2. "lex": lower ascii value first, see iter_lex
+
+        The root is read when this function is called, so in concurrent mode the words 
+        come from that version of the Trie. Otherwise, changes made during the iteration
+        may or may not be seen.
+
+        Input:
+        argument1: prefix(string)
+        argument2: order(optional)(string), "rank" or "lex"
+
+        Ouput:  words(iterator of strings)
+
+        Time Complexity:    O(n), where n is the length of prefix, the words are found
+                            by the iterator
+
+        Auxiliary space Complexity:   O(n), where n is the length of prefix
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of prefix
+        """
+        if(order not in ("rank", "lex")):
+            raise ValueError("order must be \"rank\" or \"lex\"")
+
+        root = self.root
+        path = self.walk(prefix, root)
+        if(len(path) != len(prefix)):
+            return iter(())
+
+        end = path[-1] if path else root
+        return self.iter_rank(end, root) if order == "rank" else self.iter_lex(end)
+
+
+    def iter_rank(self, end, root):
+        """
+        Function description:
+        Generator that yields the words below end by rank_key, with a best-first search.
+        The heap holds three kinds of entries, ordered by the key of their best word:
+        1. a word, which is yielded when it is popped
+        2. a subtree, whose ranking is pushed as words. A full ranking may leave out 
+           words of the subtree, which all rank after the last word of the ranking, so 
+           the rest of the subtree is pushed with that key.
+        3. the rest of a subtree, the node itself and the subtrees of its children, which
+           is expanded once the words of the ranking are popped
+        Every word that is not yielded yet is in the heap, or below an entry whose key is
+        not larger than its own key, so the words are popped in order. A word can be 
+        pushed by several rankings, so the yielded words are kept in a set. The children
+        of a node are only expanded when its ranking is exhausted, so most of the subtree
+        is never visited. The ranking of the root is only the empty word, so the root is
+        expanded at once.
+
+        Input:
+        argument1: end(Node), the node of the prefix
+        argument2: root(Node), the root of the version of end
+
+        Ouput:  words(generator of strings)
+
+        Time Complexity:    O(N * c * log(N * c)) for the first N words, where c is the 
+                            maximum number of children
+        -Analysis:  Each ranking that is exhausted gives k more words and pushes at most
+                    c subtrees, and each entry is pushed and popped once.
+
+        Auxiliary space Complexity:   O(N * c)
+        -Analysis:  The heap and the set of yielded words.
+
+        Space Complexity: O(1)(Input) + O(N * c)
+        """
+        WORD, SUBTREE, REST = 0, 1, 2
+        #The serial number keeps entries with the same key from comparing the nodes
+        heap = [((), REST if end is root else SUBTREE, 0, end)]
+        serial = 1
+        yielded = set()
+
+        while heap:
+            key, kind, _, current = heappop(heap)
+            if(kind == WORD):
+                if(current.string not in yielded):
+                    yielded.add(current.string)
+                    yield current.string
+
+            elif(kind == SUBTREE):
+                ranking = self.get_ranking(current) or []
+                for node in ranking:
+                    if(node.string not in yielded):
+                        heappush(heap, (rank_key(node), WORD, serial, node))
+                        serial += 1
+                if(len(ranking) == self.k):
+                    heappush(heap, (rank_key(ranking[-1]), REST, serial, current))
+                    serial += 1
+
+            else:
+                if(current.string is not None and current.string not in yielded):
+                    heappush(heap, (rank_key(current), WORD, serial, current))
+                    serial += 1
+                for child in current.link or []:
+                    ranking = self.get_ranking(child)
+                    if(ranking):
+                        heappush(heap, (rank_key(ranking[0]), SUBTREE, serial, child))
+                        serial += 1
+
+
+    def iter_lex(self, end):
+        """
+        Function description:
+        Generator that yields the words below end in lexicographic order, by a depth 
+        first search that visits the children sorted by their characters. A word comes
+        before the longer words that start with it, which is the ascii rule of rank_key.
+
+        Input:  end(Node), the node of the prefix
+
+        Ouput:  words(generator of strings)
+
+        Time Complexity:    O(V * c log c) for the first words, where V is the number 
+                            of nodes visited and c is the maximum number of children
+        -Analysis:  The children are stored in insertion order, so each visited node
+                    sorts them.
+
+        Auxiliary space Complexity:   O(h * c), where h is the height of the subtree
+
+        Space Complexity: O(1)(Input) + O(h * c)
+        """
+        stack = [end]
+        while stack:
+            current = stack.pop()
+            if(current.string is not None):
+                yield current.string
+            if(current.link is not None):
+                #Pushed in reverse order, so the smallest character is visited first
+                order = sorted(range(len(current.chars)), key = current.chars.__getitem__, reverse = True)
+                stack.extend(current.link[index] for index in order)
+
+
+    def walk(self, key, root = None):
+        """
+        Function description:
+        Walk down from the root along the key, and return the path, which is the list
+        of nodes from the first character of key to the deepest node that exists.
+
+        Input: 
+        argument1: key(string)
+        argument2: root(optional)(Node), the root of the version that is walked, 
+                   the current root by default
+
+        Ouput:  path(list of Node)
+
+        Time Complexity:    O(n), where n is the length of key
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+        -Analysis:  The path has at most n nodes.
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
+        """
+        path = []
+        current = self.root if root is None else root
+        for char in key:
+            #Same as self.child, inlined because this is the hot loop of search
+            index = current.chars.find(char)
+            if(index < 0):
+                break
+            current = current.link[index]
+            path.append(current)
+        return path
+    
+        
+    def correct(self, word, max_edits = 2, k = None):
+        """
+        Function description:
+        Return the words of the Trie that are within max_edits insertions, deletions or
+        substitutions of word (Levenshtein distance), ranked by smaller distance, then 
+        higher frequency, then lower ascii value. A word that is inside the Trie has
+        distance 0, so it is returned first.
+
+        The nodes are visited in the order of the smallest distance that a word below 
+        them can have, so the search stops as soon as k words are found within a 
+        distance, because every word with a larger distance is worse, see correct_search.
+        Most typos are found within one edit, which visits much fewer nodes.
+
+        Measured with k = 3 on random words of 3 to 12 letters, for words with one 
+        substitution: about 4 ms with max_edits = 1 on 300,000 and on 1,000,000 words,
+        and about 35 ms on 300,000 words and 50 ms on 1,000,000 words with the default
+        max_edits = 2, because about 60,000 nodes have a prefix within two edits of a
+        prefix of word, and none of them can be skipped. The time grows with the 
+        number of these nodes, so a larger max_edits is much slower.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(optional)(int), at least 0
+        argument3: k(optional)(int), maximum number of words, defaults to the k of the Trie
+
+        Ouput:  a list with maximum k strings, raises ValueError if max_edits is negative
+                or k is less than 1
+
+        Time Complexity:    O(V * c + S * m * s), where V is the number of nodes visited,
+                            c is the maximum number of children, m is the length of 
+                            word, S is the number of states of the automaton and s is
+                            the size of the alphabet
+        -Analysis:  Same as correct_aux.
+
+        Auxiliary space Complexity:   O(V + S * (m + s))
+
+        Space Complexity: O(m)(Input) + O(V + S * (m + s))
+        """
+        if(max_edits < 0):
+            raise ValueError("max_edits must be at least 0")
+        if(k is None):
+            k = self.k
+        if(k < 1):
+            raise ValueError("k must be at least 1")
+
+        return [candidate[2] for candidate in self.correct_aux(word, max_edits, k)]
+
+
+    def correct_aux(self, word, max_edits, k):
+        """
+        Function description:
+        Auxiliary function of correct, return the best k candidates within max_edits 
+        as a sorted list of (distance, -frequency, word), see correct_search.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(int)
+        argument3: k(int)
+
+        Ouput:  candidates(list of tuples)
+
+        Time Complexity:    O(V * c + S * m * s), same as correct_search
+
+        Auxiliary space Complexity:   O(V + S * (m + s))
+
+        Space Complexity: O(m)(Input) + O(V + S * (m + s))
+        """
+        return correct_search(word, max_edits, k, self.root, self.correct_entry, self.correct_edges)
+
+
+    @staticmethod
+    def correct_entry(current):
+        """
+        Function description: Return (frequency, word) of current for correct_search, 
+        or None if current is not a terminal node.
+
+        Input:  current(Node)
+
+        Ouput:  entry(tuple) or None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return None if current.string is None else (current.freq, current.string)
+
+
+    @staticmethod
+    def correct_edges(current):
+        """
+        Function description: Return the edges of current for correct_search, as pairs
+        of (label, child), where the label of every edge is one character.
+
+        Input:  current(Node)
+
+        Ouput:  edges(iterator of tuples)
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return zip(current.chars, current.link or ())
+
+
+    def search_many(self, keys):
+        """
+        Function description:
+        Search a batch of keys and return the result of search for every key, in the 
+        same order as the keys.
+
+        The keys are walked by prefix_walk in sorted order, so each key only walks 
+        down from the end of the common prefix with the previous key instead of from
+        the root. Keys in the search cache are answered from the cache without a walk.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K log K * M), where K is the number of keys and M is 
+                            the maximum length of key
+        -Analysis:  Same as prefix_walk.
+
+        Auxiliary space Complexity:   O(K + M)
+        -Analysis:  The sorted order and the results take K spaces, the path takes M spaces.
+
+        Space Complexity: O(K * M)(Input) + O(K + M)
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        root = self.root
+
+        def cached(position):
+            #The hit is answered here, so the key is not walked
+            if(self.cache is None):
+                return False
+            result = self.cache.get(keys[position])
+            if(result is None):
+                self.misses += 1
+                return False
+            self.cache.move_to_end(keys[position])
+            self.hits += 1
+            results[position] = list(result)
+            return True
+
+        for position, path in prefix_walk(keys, root, self.child, cached):
+            key = keys[position]
+            results[position] = self.collect(path, key, root)
+            if(self.cache is not None):
+                self.remember(key, results[position])
+
+        return results
+
+
+    def collect(self, path, key, root = None):
+        """
+        Function description:
+        Build the result of search from the path of the key, which is the list of nodes
+        from the first character of key to the deepest node that exists, excluding the root.
+        The rules are:
+        1. If the first character of key does not exist, return an empty list.
+        2. If the key is a word, return an empty list.
+        3. Otherwise merge the rankings from the deepest node up to the first node,
+           until there are k words. Only the empty key uses the ranking of the root.
+
+        Input:
+        argument1: path(list of Node)
+        argument2: key(string)
+        argument3: root(optional)(Node), the root of the version of path, 
+                   the current root by default
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n * k^2), where n is the length of path
+        -Analysis:  Each ranking has at most k pointers, and each pointer is checked 
+                    against the result, which has at most k pointers. Most keys
+                    stop at the deepest node. With ranking_depth, the chain below the 
+                    deepest node is walked once by get_ranking, and the chains on the 
+                    path reuse the ranking of the node below them.
+
+        Auxiliary space Complexity:   O(k)
+        -Analysis:  The result has at most k pointers.
+
+        Space Complexity: O(n)(Inputs) + O(1)
+        """
+        if(len(key) > 0 and len(path) == 0):
+            return []
+
+        root = self.root if root is None else root
+        end = path[-1] if path else root
+        if(len(path) == len(key) and end.string is not None):
+            return []
+
+        result = []
+        below = None
+        for current in reversed(path or [root]):
+            #A full result is final, so the rankings of the ancestors are not resolved
+            if(len(result) == self.k):
+                break
+            ranking = current.ranking
+            if(ranking is None):
+                #A node in a chain has the ranking of its only child, which is the node
+                #below it on the path, so every chain is only walked once
+                if(below is not None and not self.keeps_ranking(current)):
+                    ranking = below
+                else:
+                    ranking = self.get_ranking(current)
+            below = ranking
+            for node in ranking or []:
+                if(len(result) == self.k):
+                    break
+                #Compared by strings, since older copies of a node may be ranked in concurrent mode
+                if(node.string not in result):
+                    result.append(node.string)
+
+        return result
+
+
+    def child(self, current, char):
+        """
+        Function description:
+        This function will return the child node of current node that is linked by
+        the character, or None if the child node does not exist.
+
+        Input:
+        argument1: current(Node)
+        argument2: char(character)
+
+        Ouput:  child node(Node) or None
+
+        Time Complexity:    O(c), where c is the number of children of current
+        -Analysis:  The characters of the children are stored in a string, and str.find
+                    scans it in C. Any unicode character can be a child, and a node only
+                    stores the characters it uses, so most nodes have a few children.
+
+        Auxiliary space Complexity:   O(1)
+        -Analysis: This function does not create any lists or call itself
+
+        Space Complexity: O(1)(Inputs) + O(1)
+        """
+        index = current.chars.find(char)
+        if(index < 0):
+            return None
+        return current.link[index]
+
+
+    def add_child(self, current, char):
+        """
+        Function description:
+        This function will create a new child node of current node that is linked by
+        the character and return it. The character is appended to current.chars
+        and the node is appended to current.link at the same position.
+
+        Input:
+        argument1: current(Node)
+        argument2: char(character)
+
+        Ouput:  new child node(Node)
+
+        Time Complexity:    O(c), where c is the number of children of current
+        -Analysis:  Appending a character to the string of c characters copies it,
+                    and appending to a list takes constant time.
+
+        Auxiliary space Complexity:   O(1)
+        -Analysis: Only one node is created
+
+        Space Complexity: O(1)(Inputs) + O(1)
+        """
+        node = Node(current.height + 1)
+        if(current.link is None):
+            current.link = [node]
+        else:
+            current.link.append(node)
+        current.chars += char
+        return node
+
+
+    def remove_child(self, current, char):
+        """
+        Function description:
+        This function will remove the child node of current node that is linked by
+        the character.
+
+        Input:
+        argument1: current(Node)
+        argument2: char(character)
+
+        Ouput:  None
+
+        Time Complexity:    O(c), where c is the number of children of current
+        -Analysis:  current.chars and current.link have c items.
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Inputs) + O(1)
+        """
+        index = current.chars.find(char)
+        current.chars = current.chars[:index] + current.chars[index + 1:]
+        del current.link[index]
+        if(len(current.link) == 0):
+            current.link = None
+
+
+    def save(self, path):
+        """
+        Function description:
+        Write the Trie to a binary snapshot file, which can be loaded by Trie.load.
+
+        The nodes are numbered in breadth first order, so the root is node 0, and the
+        file stores flat tables instead of objects:
+        1. first_edge:  index of the first edge of every node, the edges of node i are
+                        first_edge[i] to first_edge[i + 1]
+        2. node_word:   word index of the terminal node, or NO_WORD
+        3. ranking:     k word indices for every node, padded with NO_WORD
+        4. labels:      unicode code point of every edge, sorted inside each node. The
+                        labels are stored in 1, 2 or 4 bytes, the smallest size that fits
+                        the largest code point, so an ascii Trie does not pay for the rest 
+                        of unicode.
+        5. targets:     node index of every edge
+        6. freqs:       frequency of every word
+        7. offsets:     start of every word inside the string pool
+        8. pool:        all words encoded in utf-8
+
+        Input:  path(string or path)
+
+        Ouput:  None
+
+        Time Complexity:    O(N log c), where N is the number of nodes and c is the 
+                            maximum number of children of a node
+        -Analysis:  Each node is visited once, and the children of a node are sorted.
+
+        Auxiliary space Complexity:   O(N + S), where N is the number of nodes and S
+                                      is the total length of the words
+        -Analysis:  The tables are built in memory before they are written.
+
+        Space Complexity: O(1)(Input) + O(N + S)
+        """
+        size = self.k
+        order = [self.root]
+        first_edge = array("I")
+        labels = array("I")
+        targets = array("I")
+
+        #Numbering the nodes and building the edges in breadth first order
+        for current in order:
+            first_edge.append(len(labels))
+            if(current.link is not None):
+                for char, child in sorted(zip(current.chars, current.link), key = lambda pair: pair[0]):
+                    labels.append(ord(char))
+                    targets.append(len(order))
+                    order.append(child)
+        first_edge.append(len(labels))
+
+        #Numbering the words
+        words = {}
+        node_word = array("I")
+        freqs = array("Q")
+        offsets = array("Q", [0])
+        pool = bytearray()
+        for current in order:
+            if(current.string is None):
+                node_word.append(NO_WORD)
+                continue
+            words[current.string] = len(freqs)
+            node_word.append(len(freqs))
+            freqs.append(current.freq)
+            pool += current.string.encode("utf-8")
+            offsets.append(len(pool))
+
+        ranking = array("I")
+        for current in order:
+            top = [words[node.string] for node in self.get_ranking(current) or []][:size]
+            ranking.extend(top + [NO_WORD] * (size - len(top)))
+
+        #The smallest typecode that fits every code point
+        largest = max(labels, default = 0)
+        label_type = "B" if largest < 1 << 8 else "H" if largest < 1 << 16 else "I"
+        labels = array(label_type, labels)
+
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder == "little", size, 
+                                      label_type.encode("ascii"), len(order), len(labels), len(freqs), len(pool))
+        sections = [first_edge, node_word, ranking, labels, targets, freqs, offsets, bytes(pool)]
+
+        with open(path, "wb") as file:
+            file.write(header)
+            position = len(header)
+            for section in sections:
+                #Every table starts at a multiple of 8 bytes
+                padding = -position % 8
+                file.write(bytes(padding))
+                data = section if isinstance(section, bytes) else section.tobytes()
+                file.write(data)
+                position += padding + len(data)
+
+
+    @staticmethod
+    def load(path):
+        """
+        Function description:
+        Load a snapshot file written by Trie.save. The file is memory mapped and 
+        searched directly, see TrieSnapshot.
+
+        Input:  path(string or path)
+
+        Ouput:  snapshot(TrieSnapshot)
+
+        Time Complexity:    O(1)
+        -Analysis:  Only the header is read, the tables are mapped instead of copied.
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return TrieSnapshot(path)
+
+
+    def freeze(self):
+        """
+        Function description:
+        Return an immutable copy of the Trie in NumPy arrays, which looks up large 
+        batches of tokens with vectorized operations, see FrozenTrie. NumPy is only 
+        imported by this function.
+
+        Input:  None
+
+        Ouput:  frozen_trie(FrozenTrie)
+
+        Time Complexity:    O(N * (c log c + k)), where N is the number of nodes
+        -Analysis:  Same as FrozenTrie.
+
+        Auxiliary space Complexity:   O(N * k)
+
+        Space Complexity: O(1)(Input) + O(N * k)
+        """
+        return FrozenTrie(self)
+    
+
+class Node:
+    """
+    Class for Node of Trie
+
+    The node uses __slots__ and sparse children, so a node without children
+    only stores six attributes instead of a dictionary and a 63-slot list. The
+    children are found by their characters, so any unicode character can be used,
+    and the memory of a node only grows with the number of its children.
+    """
+    __slots__ = ("chars", "link", "freq", "ranking", "string", "height")
+
+    def __init__(self, height = 0):
+        """
+        Function description: Constructor of Node class
+
+        Input:  height(optional)(int)
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+        -Analysis: The children and the ranking are not created until they are needed
+
+        Auxiliary space Complexity:  O(1)
+        -Analysis: Only six attributes are stored
+
+        Space Complexity:   O(1)(Input) + O(1)
+        """
+        #Characters of the children, chars[i] links to link[i]
+        self.chars = ""
+        #List of the children, created when the first child is added
+        self.link = None
+        #Frequency of the word ending at this node, 0 if no word ends here
+        self.freq = 0
+        #Store maximum k pointers sorted by rank_key, created when the first terminal node reaches this node
+        self.ranking = None
+        #The word ending at this node, None if this node is not a terminal node
+        self.string = None
+        self.height = height
+
+
+    def copy(self):
+        """
+        Function description: Return a copy of the node, with its own list of children
+        and its own ranking, that still points to the same children and terminal nodes.
+
+        Input:  None
+
+        Ouput:  node(Node)
+
+        Time Complexity:    O(c + k), where c is the number of children
+        -Analysis: The list of children has c pointers, the ranking has k pointers
+
+        Auxiliary space Complexity:  O(c + k)
+
+        Space Complexity:   O(1)(Input) + O(c + k)
+        """
+        node = Node(self.height)
+        node.chars = self.chars
+        node.link = None if self.link is None else list(self.link)
+        node.freq = self.freq
+        node.ranking = None if self.ranking is None else list(self.ranking)
+        node.string = self.string
+        return node
+      
+    
+class KeyIndex:
+    """
+    Class for the sorted set of the keys of the search cache.
+
+    The keys that start with the same prefix are next to each other in sorted order,
+    so Trie.invalidate finds them by binary search instead of scanning the cache. 
+    The keys are stored in sorted chunks of at most 2 * LOAD keys, so adding or 
+    removing a key only moves the keys of one chunk, instead of the keys of the 
+    whole cache.
+    """
+    LOAD = 256
+
+    def __init__(self):
+        """
+        Function description: Constructor of KeyIndex class
+
+        Input:  None
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:  O(1)
+
+        Space Complexity:   O(1)
+        """
+        #Sorted chunks of keys, every key of a chunk is smaller than the keys of the next chunk
+        self.chunks = []
+        #The largest key of every chunk
+        self.maxes = []
+
+
+    def add(self, key):
+        """
+        Function description: Add key, which is not in the index yet. A chunk that grows
+        to more than 2 * LOAD keys is split in two.
+
+        Input:  key(string)
+
+        Ouput:  None
+
+        Time Complexity:    O(log C + LOAD), where C is the number of keys
+
+        Auxiliary space Complexity:   O(LOAD)
+
+        Space Complexity: O(1)(Input) + O(LOAD)
+        """
+        if(len(self.chunks) == 0):
+            self.chunks.append([key])
+            self.maxes.append(key)
+            return
+
+        #The first chunk whose largest key is not smaller, or the last chunk
+        index = min(bisect_left(self.maxes, key), len(self.chunks) - 1)
+        chunk = self.chunks[index]
+        insort(chunk, key)
+        self.maxes[index] = chunk[-1]
+
+        if(len(chunk) > 2 * self.LOAD):
+            self.chunks[index:index + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+            self.maxes[index:index + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+
+
+    def discard(self, key):
+        """
+        Function description: Remove key if it is in the index. An empty chunk is removed.
+
+        Input:  key(string)
+
+        Ouput:  None
+
+        Time Complexity:    O(log C + LOAD), where C is the number of keys
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        index = bisect_left(self.maxes, key)
+        if(index == len(self.chunks)):
+            return
+
+        chunk = self.chunks[index]
+        position = bisect_left(chunk, key)
+        if(position < len(chunk) and chunk[position] == key):
+            del chunk[position]
+            if(chunk):
+                self.maxes[index] = chunk[-1]
+            else:
+                del self.chunks[index]
+                del self.maxes[index]
+
+
+    def pop_prefix(self, prefix):
+        """
+        Function description:
+        Remove and return every key that starts with prefix. These keys are a run of 
+        consecutive keys, which starts at the first key that is not smaller than prefix,
+        and may continue over several chunks.
+
+        Input:  prefix(string)
+
+        Ouput:  keys(list of strings)
+
+        Time Complexity:    O(log C + R + LOAD), where C is the number of keys and R
+                            is the number of keys removed
+
+        Auxiliary space Complexity:   O(R)
+
+        Space Complexity: O(1)(Input) + O(R)
+        """
+        removed = []
+        index = bisect_left(self.maxes, prefix)
+        while index < len(self.chunks):
+            chunk = self.chunks[index]
+            start = bisect_left(chunk, prefix)
+            end = start
+            while end < len(chunk) and chunk[end].startswith(prefix):
+                end += 1
+            removed.extend(chunk[start:end])
+            #The run continues in the next chunk only if it reached the end of this chunk
+            finished = end < len(chunk)
+            del chunk[start:end]
+
+            if(chunk):
+                self.maxes[index] = chunk[-1]
+                index += 1
+            else:
+                del self.chunks[index]
+                del self.maxes[index]
+            if(finished):
+                break
+
+        return removed
+
+
+class RadixTrie(Trie):
+    """
+    Class for the path compressed variant of Trie.
+
+    A chain of nodes with a single child and no word collapses into one edge, which is
+    labelled with the substring of the chain. Every node of a chain has the same words 
+    below it, so they all have the same ranking, and the ranking is only stored once,
+    at the end of the edge. The remaining nodes are the root, the branching nodes, the
+    terminal nodes and the leaves.
+
+    Every operation of Trie returns the same results. save and freeze expand the edges
+    into a Trie first, since the snapshot and the FrozenTrie have one node for every 
+    character. The concurrent mode and the lazy mode are only supported by Trie, and 
+    the instrumentation does not count nodes_created and ranking_refills.
+    """
+    COUNTED = ("walk", "update_ranking", "collect")
+
+    def __init__(self, k = 3, cache_size = None, concurrent = False, instrument = False, on_timing = None, lazy = False,
+                 ranking_depth = None):
+        """
+        Function description: Constructor of RadixTrie class, the options are the same 
+        as the options of Trie.
+
+        Input:  
+        argument1: k(optional)(int), maximum number of words returned by search
+        argument2: cache_size(optional)(int), see Trie
+        argument3: concurrent(optional)(bool), must be False
+        argument4: instrument(optional)(bool), see Trie
+        argument5: on_timing(optional)(callable), see Trie
+        argument6: lazy(optional)(bool), must be False
+        argument7: ranking_depth(optional)(int), must be None
+
+        Ouput:  None, raises ValueError for the concurrent mode and the lazy mode
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:O(1)
+
+        Space Complexity:   O(1)
+        """
+        #The writers split and merge edges in place, so the path can not be copied by copy_path
+        if(concurrent):
+            raise ValueError("the concurrent mode can not be used with RadixTrie")
+        #The rankings are already stored once for every edge
+        if(lazy or ranking_depth is not None):
+            raise ValueError("the lazy mode can not be used with RadixTrie")
+
+        Trie.__init__(self, k, cache_size)
+        self.root = RadixNode()
+        if(instrument or on_timing is not None):
+            self.instrument(on_timing)
+
+
+    @classmethod
+    def from_counts(cls, mapping, **options):
+        """
+        Function description:
+        Same as Trie.from_counts, each distinct word is walked once by descend, and the
+        rankings are computed by build_rankings.
+
+        Input:  
+        argument1: mapping(dict of string to int)
+        argument2: options(optional), keyword arguments of the constructor
+
+        Ouput:  trie(RadixTrie)
+
+        Time Complexity:    O(N), where N is the total length of distinct words
+
+        Auxiliary space Complexity:   O(N), where N is the total length of distinct words
+
+        Space Complexity: O(W)(Input) + O(N), where W is the size of the mapping
+        """
+        trie = cls(**options)
+        for key, freq in mapping.items():
+            #Words that never occur are not part of the Trie
+            if(freq <= 0):
+                continue
+
+            current = trie.descend(key)[-1]
+            if(current.string is None):
+                current.string = key
+            current.freq += freq
+
+        trie.build_rankings()
+        return trie
+
+
+    def descend(self, key):
+        """
+        Function description:
+        Walk down from the root along the key, creating the missing nodes, and return
+        the path of nodes from the root to the node where key ends:
+        1. If no edge starts with the next character, a leaf with the rest of key as 
+           its label is added.
+        2. If key leaves an edge in the middle, or ends in the middle, the edge is split
+           by a new node, which gets a copy of the ranking of the lower node, because 
+           they have the same words below them.
+
+        Input:  key(string)
+
+        Ouput:  path(list of RadixNode)
+
+        Time Complexity:    O(n), where n is the length of key
+        -Analysis:  Every character of key is compared once with a label.
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+
+        Space Complexity: O(1)(Input) + O(n)
+        """
+        current = self.root
+        path = [current]
+        position = 0
+        while position < len(key):
+            index = current.chars.find(key[position])
+
+            #No edge starts with the character, the rest of key becomes a leaf
+            if(index < 0):
+                child = RadixNode(key[position:])
+                current.chars += key[position]
+                if(current.link is None):
+                    current.link = []
+                current.link.append(child)
+                path.append(child)
+                break
+
+            child = current.link[index]
+            label = child.label
+            common = 1
+            limit = min(len(label), len(key) - position)
+            while common < limit and label[common] == key[position + common]:
+                common += 1
+
+            #Splitting the edge, the new node is the parent of child
+            if(common < len(label)):
+                middle = RadixNode(label[:common])
+                child.label = label[common:]
+                middle.chars = child.label[0]
+                middle.link = [child]
+                middle.ranking = None if child.ranking is None else list(child.ranking)
+                current.link[index] = middle
+                child = middle
+
+            path.append(child)
+            current = child
+            position += common
+
+        return path
+
+
+    def insert_aux(self, current, key, height, count = 1):
+        """
+        Function description:
+        Same as Trie.insert_aux, the path is found by descend, and the rankings of the 
+        nodes on the path are updated from the terminal node back to the first node.
+
+        Input:
+        argument1:current(RadixNode), only the root is supported
+        argument2:key(string)
+        argument3:height(int)
+        argument4:count(optional)(int), the increase of the frequency
+
+        Ouput:  terminal_node(RadixNode)
+
+        Time Complexity:    O(n + m log k), where n is the length of key and m is the 
+                            number of nodes on the path
+
+        Auxiliary space Complexity:   O(m), where m is the number of nodes on the path
+
+        Space Complexity: O(1)(Inputs) + O(m)
+        """
+        path = self.descend(key)
+        terminal_node = path[-1]
+        if(terminal_node.string is None):
+            terminal_node.string = key
+
+        previous = rank_key(terminal_node)
+        terminal_node.freq += count
+
+        #Only the empty word updates the ranking of the root
+        for current in reversed(path[1:] or path):
+            self.update_ranking(terminal_node, current, previous)
+
+        return terminal_node
+
+
+    def walk(self, key, root = None):
+        """
+        Function description:
+        Walk down from the root along the key without changing the Trie. Return the path,
+        which is the list of nodes whose edges were entered by at least one character of
+        key, and the number of characters of key that were matched. The last edge may be
+        left in the middle.
+
+        Input: 
+        argument1: key(string)
+        argument2: root(optional)(RadixNode), the current root by default
+
+        Ouput:  (path(list of RadixNode), matched(int))
+
+        Time Complexity:    O(n), where n is the length of key
+
+        Auxiliary space Complexity:   O(m), where m is the number of nodes on the path
+
+        Space Complexity: O(1)(Input) + O(m)
+        """
+        current = self.root if root is None else root
+        path = []
+        position = 0
+        while position < len(key):
+            index = current.chars.find(key[position])
+            if(index < 0):
+                break
+            current = current.link[index]
+            path.append(current)
+
+            label = current.label
+            if(key.startswith(label, position)):
+                position += len(label)
+                continue
+
+            #Leaving the edge in the middle
+            common = 1
+            limit = min(len(label), len(key) - position)
+            while common < limit and label[common] == key[position + common]:
+                common += 1
+            position += common
+            break
+
+        return path, position
+
+
+    def path_state(self, key):
+        """
+        Function description:
+        Same as Trie.path_state, the state of every character of key that is inside the
+        Trie. A character in the middle of an edge has the ranking of the node at the 
+        end of the edge, and it is never a terminal node.
+
+        Input:  key(string)
+
+        Ouput:  states(list of tuples)
+
+        Time Complexity:    O(n), where n is the length of key
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+
+        Space Complexity: O(1)(Input) + O(n)
+        """
+        path, matched = self.walk(key)
+        root = self.root
+        states = [(tuple(root.ranking or ()), root.string is not None)]
+        depth = 0
+        for current in path:
+            ranking = tuple(current.ranking or ())
+            #The last edge may be left in the middle
+            count = min(len(current.label), matched - depth)
+            states.extend([(ranking, False)] * (count - 1))
+            states.append((ranking, count == len(current.label) and current.string is not None))
+            depth += count
+        return states
+
+
+    def collect(self, walked, key, root = None):
+        """
+        Function description:
+        Same as Trie.collect, for the result of walk. A node in the middle of an edge 
+        has the same ranking as the node at the end of the edge, so merging the 
+        rankings of the nodes on the path gives the same words as merging the rankings
+        of every character.
+
+        Input:
+        argument1: walked(tuple), (path, matched) returned by walk
+        argument2: key(string)
+        argument3: root(optional)(RadixNode), the current root by default
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(m * k^2), where m is the number of nodes on the path
+
+        Auxiliary space Complexity:   O(k)
+
+        Space Complexity: O(m)(Input) + O(k)
+        """
+        path, matched = walked
+        root = self.root if root is None else root
+
+        #If the first character of key does not exist, return an empty list
+        if(len(key) > 0 and len(path) == 0):
+            return []
+
+        #The key is a word
+        end = path[-1] if path else root
+        if(matched == len(key) and end.string == key):
+            return []
+
+        result = []
+        for current in reversed(path or [root]):
+            if(len(result) == self.k):
+                break
+            for node in current.ranking or []:
+                if(len(result) == self.k):
+                    break
+                if(node.string not in result):
+                    result.append(node.string)
+
+        return result
+
+
+    def search_many(self, keys):
+        """
+        Function description: Return the result of search for every key, in the same order.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K * (M + m * k^2)), where K is the number of keys, M is 
+                            the maximum length of key and m is the number of nodes on a path
+
+        Auxiliary space Complexity:   O(K)
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        return [self.search(key) for key in keys]
+
+
+    def complete(self, key):
+        """
+        Function description: Same as Trie.complete, return the ranking of the node where
+        key ends, which is the node at the end of the edge if key ends in the middle of it.
+
+        Input: key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n + k), where n is the length of key
+
+        Auxiliary space Complexity:   O(m), where m is the number of nodes on the path
+
+        Space Complexity: O(1)(Input) + O(m)
+        """
+        path, matched = self.walk(key)
+        if(matched != len(key)):
+            return []
+
+        end = path[-1] if path else self.root
+        return [node.string for node in end.ranking or []]
+
+
+    def complete_many(self, keys):
+        """
+        Function description: Return the result of complete for every key, in the same order.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K * (M + k)), where K is the number of keys and M is the 
+                            maximum length of key
+
+        Auxiliary space Complexity:   O(K)
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        return [self.complete(key) for key in keys]
+
+
+    def iter_prefix(self, prefix, order = "rank"):
+        """
+        Function description: Same as Trie.iter_prefix. If prefix ends in the middle of
+        an edge, the words are the words below the node at the end of the edge.
+
+        Input:
+        argument1: prefix(string)
+        argument2: order(optional)(string), "rank" or "lex"
+
+        Ouput:  words(iterator of strings)
+
+        Time Complexity:    O(n), where n is the length of prefix
+
+        Auxiliary space Complexity:   O(m), where m is the number of nodes on the path
+
+        Space Complexity: O(1)(Input) + O(m)
+        """
+        if(order not in ("rank", "lex")):
+            raise ValueError("order must be \"rank\" or \"lex\"")
+
+        root = self.root
+        path, matched = self.walk(prefix, root)
+        if(matched != len(prefix)):
+            return iter(())
+
+        end = path[-1] if path else root
+        return self.iter_rank(end, root) if order == "rank" else self.iter_lex(end)
+
+
+    def frequency(self, key):
+        """
+        Function description: Same as Trie.frequency.
+
+        Input:  key(string)
+
+        Ouput:  frequency(int)
+
+        Time Complexity:    O(n), where n is the length of key
+
+        Auxiliary space Complexity:   O(m), where m is the number of nodes on the path
+
+        Space Complexity: O(1)(Input) + O(m)
+        """
+        path, matched = self.walk(key)
+        end = path[-1] if path else self.root
+        return end.freq if matched == len(key) and end.string == key else 0
+
+
+    def decrease_aux(self, current, key, amount):
+        """
+        Function description:
+        Same as Trie.decrease_aux, the path is looped through from the terminal node back
+        to the first node:
+        1. A node without word and without children is removed from its parent.
+        2. A node without word and with a single child is merged with the child, whose
+           label becomes the label of both edges. The child already has the ranking of 
+           the node, since they have the same words below them.
+        3. Otherwise the ranking is computed again from the node and its children by 
+           compute_rankings. A path of a RadixTrie has few nodes, so this is simpler 
+           than repairing the ranking by update_ranking.
+
+        Input:
+        argument1:current(RadixNode), only the root is supported
+        argument2:key(string)
+        argument3:amount(int), the decrease of the frequency
+
+        Ouput:  None, raises KeyError if key is not a word of the Trie
+
+        Time Complexity:    O(n + m * c * k log k), where n is the length of key, m is the 
+                            number of nodes on the path and c is the maximum number of children
+
+        Auxiliary space Complexity:   O(m + c * k)
+
+        Space Complexity: O(1)(Inputs) + O(m + c * k)
+        """
+        path, matched = self.walk(key, current)
+        path = [current] + path
+        terminal_node = path[-1]
+        if(matched != len(key) or terminal_node.string != key):
+            raise KeyError(key)
+
+        if(terminal_node.freq > amount):
+            terminal_node.freq -= amount
+        else:
+            #The node is not a terminal node anymore
+            terminal_node.freq = 0
+            terminal_node.string = None
+
+        for height in range(len(path) - 1, 0, -1):
+            current = path[height]
+            parent = path[height - 1]
+
+            #Removing the node that has no word below it
+            if(current.string is None and current.link is None):
+                self.remove_child(parent, current.label[0])
+                continue
+
+            #Merging the chain, the child takes the place of current
+            if(current.string is None and len(current.link) == 1):
+                child = current.link[0]
+                child.label = current.label + child.label
+                parent.link[parent.chars.find(current.label[0])] = child
+                continue
+
+            self.compute_rankings([current])
+
+        #Only the empty word changes the ranking of the root
+        if(len(path) == 1):
+            current.ranking = [current] if current.string is not None else None
+
+
+    @staticmethod
+    def correct_edges(current):
+        """
+        Function description: Same as Trie.correct_edges, the label of an edge is the
+        label of the child, so correct_search moves the state through every character
+        of it.
+
+        Input:  current(RadixNode)
+
+        Ouput:  edges(iterator of tuples)
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return ((child.label, child) for child in current.link or ())
+
+
+    def expand(self):
+        """
+        Function description: Return a Trie with the same words, frequencies and k, 
+        which has one node for every character.
+
+        Input:  None
+
+        Ouput:  trie(Trie)
+
+        Time Complexity:    O(N), where N is the total length of the words
+
+        Auxiliary space Complexity:   O(N)
+
+        Space Complexity: O(1)(Input) + O(N)
+        """
+        counts = {}
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            if(current.string is not None):
+                counts[current.string] = current.freq
+            stack.extend(current.link or [])
+        return Trie.from_counts(counts, k = self.k)
+
+
+    def save(self, path):
+        """
+        Function description: Same as Trie.save, the snapshot is written from expand, 
+        so it is loaded by Trie.load and SpellChecker.load.
+
+        Input:  path(string or path)
+
+        Ouput:  None
+
+        Time Complexity:    O(N), where N is the total length of the words
+
+        Auxiliary space Complexity:   O(N)
+
+        Space Complexity: O(1)(Input) + O(N)
+        """
+        self.expand().save(path)
+
+
+    def freeze(self):
+        """
+        Function description: Same as Trie.freeze, the FrozenTrie is built from expand.
+
+        Input:  None
+
+        Ouput:  frozen_trie(FrozenTrie)
+
+        Time Complexity:    O(N * (c log c + k)), where N is the total length of the words
+
+        Auxiliary space Complexity:   O(N * k)
+
+        Space Complexity: O(1)(Input) + O(N * k)
+        """
+        return self.expand().freeze()
+
+
+class RadixNode:
+    """
+    Class for Node of RadixTrie
+
+    Same as Node, but the node also stores the label of the edge from its parent, and
+    it does not store the height, which is not used by RadixTrie.
+    """
+    __slots__ = ("label", "chars", "link", "freq", "ranking", "string")
+
+    def __init__(self, label = ""):
+        """
+        Function description: Constructor of RadixNode class
+
+        Input:  label(optional)(string), the label of the edge from the parent
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:  O(1)
+
+        Space Complexity:   O(1)(Input) + O(1)
+        """
+        self.label = label
+        #First characters of the labels of the children, chars[i] links to link[i]
+        self.chars = ""
+        self.link = None
+        self.freq = 0
+        self.ranking = None
+        self.string = None
+
+
+def counting(name, method, counters, trie):
+    """
+    Function description:
+    Return a wrapper of the bound method of the trie that updates the counters, see 
+    Trie.instrument.
+
+    Input:
+    argument1: name(string), one of Trie.COUNTED
+    argument2: method(bound method)
+    argument3: counters(Counter)
+    argument4: trie(Trie)
+
+    Ouput:  wrapper(function)
+
+    Time Complexity:    O(1)
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(1)(Input) + O(1)
+    """
+    if(name == "add_child"):
+        def wrapper(current, char):
+            counters["nodes_created"] += 1
+            return method(current, char)
+
+    elif(name == "child"):
+        def wrapper(current, char):
+            child = method(current, char)
+            if(child is not None):
+                counters["nodes_visited"] += 1
+            return child
+
+    elif(name == "walk"):
+        def wrapper(key, root = None):
+            path = method(key, root)
+            counters["walks"] += 1
+            #The walk of RadixTrie also returns the number of matched characters
+            counters["nodes_visited"] += len(path[0] if isinstance(path, tuple) else path)
+            return path
+
+    elif(name == "update_ranking"):
+        def wrapper(terminal_node, current, previous):
+            before = None if current.ranking is None else list(current.ranking)
+            method(terminal_node, current, previous)
+            counters["ranking_updates"] += 1
+            if(current.ranking != before):
+                counters["ranking_changes"] += 1
+
+    elif(name == "refill_ranking"):
+        def wrapper(current):
+            counters["ranking_refills"] += 1
+            return method(current)
+
+    else:
+        def wrapper(path, key, root = None):
+            result = method(path, key, root)
+            counters["searches"] += 1
+            if(isinstance(path, tuple)):
+                path = path[0]
+            #The ranking of the deepest node did not have enough words. A node without
+            #its own ranking is compared with the ranking that collect resolved for it
+            end = path[-1] if path else (trie.root if root is None else root)
+            if(len(result) > len(trie.get_ranking(end) or [])):
+                counters["fallbacks"] += 1
+            return result
+
+    return wrapper
+
+
+def timing(name, method, on_timing):
+    """
+    Function description:
+    Return a wrapper of the bound method that calls on_timing with the name, the first
+    argument and the seconds of every call, see Trie.instrument.
+
+    Input:
+    argument1: name(string), one of Trie.TIMED
+    argument2: method(bound method)
+    argument3: on_timing(callable)
+
+    Ouput:  wrapper(function)
+
+    Time Complexity:    O(1)
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(1)(Input) + O(1)
+    """
+    clock = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        result = method(*args, **kwargs)
+        on_timing(name, args[0] if args else None, clock() - start)
+        return result
+
+    return wrapper
+
+
+class LevenshteinAutomaton:
+    """
+    Class for the Levenshtein automaton of a word, used by correct.
+
+    A state is the row of the Levenshtein table of some text, where row[j] is the edit 
+    distance between the text and word[:j], and every value larger than max_edits is 
+    stored as max_edits + 1. The cells that are not larger than max_edits are still 
+    exact, because the values along an optimal path of the table never decrease, so 
+    the next row only depends on the row and the next character of the text. Many 
+    nodes of a Trie have the same row, so the next state of every (state, character)
+    is computed once and stored in the state.
+
+    A state is a tuple (row, minimum of row, transitions), where the transitions are
+    a dictionary from a character to the next state.
+    """
+    def __init__(self, word, max_edits):
+        """
+        Function description: Constructor of LevenshteinAutomaton class, the start 
+        state is the row of the empty text.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(int)
+
+        Ouput:  None
+
+        Time Complexity:    O(m), where m is the length of word
+
+        Auxiliary space Complexity:  O(m)
+
+        Space Complexity:   O(m)(Input) + O(m)
+        """
+        self.word = word
+        self.far = max_edits + 1
+        #The states by their rows
+        self.states = {}
+        self.start = self.state(tuple(min(j, self.far) for j in range(len(word) + 1)))
+
+
+    def state(self, row):
+        """
+        Function description: Return the state of the row, creating it the first time.
+
+        Input:  row(tuple of int)
+
+        Ouput:  state(tuple)
+
+        Time Complexity:    O(m), where m is the length of word
+
+        Auxiliary space Complexity:  O(m)
+
+        Space Complexity:   O(m)(Input) + O(m)
+        """
+        state = self.states.get(row)
+        if(state is None):
+            state = self.states[row] = (row, min(row), {})
+        return state
+
+
+    def move(self, state, char):
+        """
+        Function description:
+        Return the next state after char, and store it in the transitions of state. 
+        Every cell is the smallest of a substitution or a match, an insertion and a 
+        deletion.
+
+        Input:
+        argument1: state(tuple)
+        argument2: char(character)
+
+        Ouput:  state(tuple)
+
+        Time Complexity:    O(m), where m is the length of word
+
+        Auxiliary space Complexity:   O(m)
+
+        Space Complexity: O(1)(Inputs) + O(m)
+        """
+        previous_row = state[0]
+        far = self.far
+        left = min(previous_row[0] + 1, far)
+        row = [left]
+        for j, letter in enumerate(self.word, 1):
+            value = min(previous_row[j - 1] + (letter != char), left + 1, previous_row[j] + 1, far)
+            row.append(value)
+            left = value
+
+        following = state[2][char] = self.state(tuple(row))
+        return following
+
+
+def correct_search(word, max_edits, k, root, entry, edges):
+    """
+    Function description:
+    The search of correct for every kind of Trie, return the best k candidates within
+    max_edits as a sorted list of (distance, -frequency, word).
+
+    Every node is reached with a state of the LevenshteinAutomaton of word, which 
+    holds the row of the Levenshtein table of the prefix of the node. The minimum 
+    of the row is the smallest distance of a word below the node, because the rows
+    of the descendants can only be larger. The nodes are kept in one stack for 
+    every minimum, and the stacks are emptied from the smallest minimum up, so the
+    nodes within d edits are all visited before the nodes within d + 1 edits. 
+    When k candidates are found, the budget becomes the distance of the worst 
+    candidate, and the nodes whose minimum is larger are never visited. Each node 
+    is only visited once, and a state and a character lead to the same next state
+    at every node, so the rows are only computed once for every distinct state.
+
+    A child is reached by moving the state through every character of the label of
+    its edge. The minimum of a state never becomes smaller, so a long label is left 
+    as soon as the minimum is larger than the budget.
+
+    Input:
+    argument1: word(string)
+    argument2: max_edits(int)
+    argument3: k(int)
+    argument4: root(any), the root node
+    argument5: entry(callable), entry(node) is (frequency, word) of a terminal node,
+               None otherwise
+    argument6: edges(callable), edges(node) is an iterable of (label, child)
+
+    Ouput:  candidates(list of tuples)
+
+    Time Complexity:    O(V * c + S * m * s), where V is the number of characters of 
+                        the nodes visited, c is the maximum number of children, m is 
+                        the length of word, S is the number of states and s is the 
+                        size of the alphabet
+    -Analysis:  Each visited node looks up the next state of each of its children
+                in a dictionary, and each new state computes one row of m + 1 cells.
+
+    Auxiliary space Complexity:   O(V + S * (m + s))
+    -Analysis:  The stacks of the nodes waiting to be visited, and the rows and the
+                transitions of the states.
+
+    Space Complexity: O(m)(Input) + O(V + S * (m + s))
+    """
+    #Sorted list of the best candidates, (distance, -frequency, word)
+    best = []
+    budget = max_edits
+    automaton = LevenshteinAutomaton(word, max_edits)
+    move = automaton.move
+
+    #stacks[d] holds (node, state) of the nodes whose minimum is d
+    stacks = [[] for _ in range(max_edits + 1)]
+    stacks[0].append((root, automaton.start))
+
+    for minimum in range(max_edits + 1):
+        stack = stacks[minimum]
+        while stack and minimum <= budget:
+            current, state = stack.pop()
+            distance = state[0][-1]
+
+            if(distance <= budget):
+                found = entry(current)
+                if(found is not None):
+                    candidate = (distance, -found[0], found[1])
+                    if(len(best) < k or candidate < best[-1]):
+                        insort(best, candidate)
+                        if(len(best) > k):
+                            best.pop()
+                        if(len(best) == k):
+                            budget = min(max_edits, best[-1][0])
+
+            moves = state[2]
+            for label, child in edges(current):
+                #Most labels are one character whose next state is known already
+                following = moves.get(label)
+                if(following is None):
+                    following = state
+                    for char in label:
+                        following = following[2].get(char) or move(following, char)
+                        if(following[1] > budget):
+                            break
+                #Skipping the subtree when every prefix of word is too far away
+                if(following[1] <= budget):
+                    stacks[following[1]].append((child, following))
+
+    return best
+
+
+def prefix_walk(keys, root, child, skip = None):
+    """
+    Function description:
+    The walk of search_many and complete_many for every kind of Trie, generator that 
+    yields (position, path) for every key, where path is the list of nodes from the 
+    first character of keys[position] to the deepest node that exists, excluding the
+    root.
+
+    The keys are visited in sorted order, so neighbouring keys share their longest
+    prefixes. The path of the previous key is kept, and the next key only walks down
+    from the end of their common prefix instead of from the root. The same list is 
+    yielded every time and changed by the next key, so it must be used before the 
+    generator is advanced. A key where skip(position) is True is not walked nor 
+    yielded, and the path is kept for the next key.
+
+    Input:
+    argument1: keys(list of strings)
+    argument2: root(any), the root node
+    argument3: child(callable), child(node, char) is the child of node, or None
+    argument4: skip(optional)(callable), skip(position) is True for a key that is 
+               answered without its path
+
+    Ouput:  generator of (position(int), path(list))
+
+    Time Complexity:    O(K log K * M), where K is the number of keys and M is 
+                        the maximum length of key
+    -Analysis:  Sorting the keys takes O(K log K) comparisons of strings. After that,
+                each key only walks the characters after the common prefix with 
+                the previous key, which is at most M nodes.
+
+    Auxiliary space Complexity:   O(K + M)
+    -Analysis:  The sorted order takes K spaces, the path takes M spaces.
+
+    Space Complexity: O(K * M)(Input) + O(K + M)
+    """
+    previous = ""
+    path = []
+
+    for position in sorted(range(len(keys)), key = keys.__getitem__):
+        if(skip is not None and skip(position)):
+            continue
+        key = keys[position]
+
+        #Reusing the nodes of the common prefix with the previous key
+        common = 0
+        limit = min(len(key), len(path))
+        while common < limit and key[common] == previous[common]:
+            common += 1
+        del path[common:]
+
+        #Walking down from the end of the common prefix
+        current = path[-1] if path else root
+        while len(path) < len(key):
+            current = child(current, key[len(path)])
+            if(current is None):
+                break
+            path.append(current)
+
+        yield position, path
+        previous = key
+
+
+class TrieSnapshot:
+    """
+    Class for a read-only Trie that is loaded from a snapshot file written by Trie.save.
+    
+    The file is memory mapped and the tables are read through memoryviews, so no Node
+    is created, loading takes constant time, and processes that load the same file 
+    share the pages of the file.
+    """
+    def __init__(self, path):
+        """
+        Function description: Constructor of TrieSnapshot class
+
+        Input:  path(string or path)
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+        -Analysis:  Only the header is read, and casting a memoryview does not copy the data.
+
+        Auxiliary space Complexity:  O(1)
+
+        Space Complexity:   O(1)(Input) + O(1)
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+        view = memoryview(self.buffer)
+        magic, version, little, size, label_type, nodes, edges, words, pool = SNAPSHOT_HEADER.unpack_from(view)
+        if(magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION):
+            raise ValueError("%s is not a Trie snapshot" % path)
+        if(bool(little) != (sys.byteorder == "little")):
+            raise ValueError("%s was written on a machine with another byte order" % path)
+
+        self.size = size
+        position = SNAPSHOT_HEADER.size
+        tables = []
+        for typecode, length in (("I", nodes + 1), ("I", nodes), ("I", nodes * size), (label_type.decode("ascii"), edges), 
+                                 ("I", edges), ("Q", words), ("Q", words + 1), ("B", pool)):
+            position += -position % 8
+            end = position + length * array(typecode).itemsize
+            tables.append(view[position:end].cast(typecode))
+            position = end
+
+        (self.first_edge, self.node_word, self.ranking, self.labels, 
+         self.targets, self.freqs, self.offsets, self.pool) = tables
+
+
+    def close(self):
+        """
+        Function description: Release the memory mapped file. The snapshot can not be 
+        searched after it is closed.
+
+        Input:  None
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:  O(1)
+
+        Space Complexity:   O(1)
+        """
+        for table in (self.first_edge, self.node_word, self.ranking, self.labels, 
+                      self.targets, self.freqs, self.offsets, self.pool):
+            table.release()
+        self.buffer.close()
+
+
+    def child(self, node, char):
+        """
+        Function description:
+        Return the index of the child of node that is linked by the character, or None.
+        The labels of the edges of a node are sorted, so binary search is used.
+
+        Input:
+        argument1: node(int)
+        argument2: char(character)
+
+        Ouput:  child node index(int) or None
+
+        Time Complexity:    O(log c), where c is the number of children of node
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Inputs) + O(1)
+        """
+        low = self.first_edge[node]
+        high = self.first_edge[node + 1]
+        code = ord(char)
+        position = bisect_left(self.labels, code, low, high)
+        if(position < high and self.labels[position] == code):
+            return self.targets[position]
+        return None
+
+
+    def word(self, index):
+        """
+        Function description: Decode the word with this index from the string pool.
+
+        Input:  index(int)
+
+        Ouput:  word(string)
+
+        Time Complexity:    O(n), where n is the length of the word
+
+        Auxiliary space Complexity:   O(n), where n is the length of the word
+
+        Space Complexity: O(1)(Input) + O(n)
+        """
+        return bytes(self.pool[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+
+    def search(self, key):
+        """
+        Function description:
+        Same as Trie.search, but the nodes and rankings are read from the mapped tables.
+        The nodes on the path of the key are collected first, then collect merges 
+        their rankings.
+
+        Input: key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n log c), where n is the length of key and c is the 
+                            maximum number of children of a node
+
+        Auxiliary space Complexity:   O(n), where n is the length of key
+        -Analysis:  The path of the key is stored, and collect builds the result.
+
+        Space Complexity: O(1)(Input) + O(n), where n is the length of key
+        """
+        node = 0
+        path = []
+        for char in key:
+            node = self.child(node, char)
+            if(node is None):
+                break
+            path.append(node)
+
+        return self.collect(path, key)
+
+
+    def complete(self, key):
+        """
+        Function description:
+        Same as Trie.complete, return the ranking of the node of key.
+
+        Input: key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n log c + k), where n is the length of key and c is the 
+                            maximum number of children of a node
+
+        Auxiliary space Complexity:   O(k)
+
+        Space Complexity: O(1)(Input) + O(k)
+        """
+        node = 0
+        for char in key:
+            node = self.child(node, char)
+            if(node is None):
+                return []
+
+        start = node * self.size
+        return [self.word(word) for word in self.ranking[start:start + self.size] if word != NO_WORD]
+
+
+    def complete_many(self, keys):
+        """
+        Function description: Return the result of complete for every key, in the same order.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K * (M log c + k)), where K is the number of keys and M is
+                            the maximum length of key
+
+        Auxiliary space Complexity:   O(K)
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        return [self.complete(key) for key in keys]
+
+
+    def iter_prefix(self, prefix, order = "rank"):
+        """
+        Function description: Same as Trie.iter_prefix, see iter_rank and iter_lex.
+
+        Input:
+        argument1: prefix(string)
+        argument2: order(optional)(string), "rank" or "lex"
+
+        Ouput:  words(iterator of strings)
+
+        Time Complexity:    O(n log c), where n is the length of prefix, the words are 
+                            found by the iterator
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        if(order not in ("rank", "lex")):
+            raise ValueError("order must be \"rank\" or \"lex\"")
+
+        node = 0
+        for char in prefix:
+            node = self.child(node, char)
+            if(node is None):
+                return iter(())
+
+        return self.iter_rank(node) if order == "rank" else self.iter_lex(node)
+
+
+    def rank_key(self, index):
+        """
+        Function description: Same as rank_key, for the word with this index.
+
+        Input:  index(int)
+
+        Ouput:  key(tuple)
+
+        Time Complexity:    O(n), where n is the length of the word
+
+        Auxiliary space Complexity:   O(n)
+
+        Space Complexity: O(1)(Input) + O(n)
+        """
+        return (-self.freqs[index], self.word(index))
+
+
+    def iter_rank(self, end):
+        """
+        Function description:
+        Same as Trie.iter_rank, a best-first search over the words, the full rankings,
+        and the rest of the subtrees below end. The words are kept as their indexes.
+
+        Input:  end(int), the node of the prefix
+
+        Ouput:  words(generator of strings)
+
+        Time Complexity:    O(N * c * log(N * c)) for the first N words, where c is the 
+                            maximum number of children
+
+        Auxiliary space Complexity:   O(N * c)
+
+        Space Complexity: O(1)(Input) + O(N * c)
+        """
+        WORD, SUBTREE, REST = 0, 1, 2
+        size = self.size
+        heap = [((), REST if end == 0 else SUBTREE, end)]
+        yielded = set()
+
+        while heap:
+            key, kind, current = heappop(heap)
+            if(kind == WORD):
+                if(current not in yielded):
+                    yielded.add(current)
+                    yield key[1]
+
+            elif(kind == SUBTREE):
+                ranking = [index for index in self.ranking[current * size:(current + 1) * size] if index != NO_WORD]
+                for index in ranking:
+                    if(index not in yielded):
+                        heappush(heap, (self.rank_key(index), WORD, index))
+                if(len(ranking) == size):
+                    heappush(heap, (self.rank_key(ranking[-1]), REST, current))
+
+            else:
+                index = self.node_word[current]
+                if(index != NO_WORD and index not in yielded):
+                    heappush(heap, (self.rank_key(index), WORD, index))
+                for edge in range(self.first_edge[current], self.first_edge[current + 1]):
+                    child = self.targets[edge]
+                    best = self.ranking[child * size]
+                    if(best != NO_WORD):
+                        heappush(heap, (self.rank_key(best), SUBTREE, child))
+
+
+    def iter_lex(self, end):
+        """
+        Function description:
+        Same as Trie.iter_lex. The labels of the edges of a node are sorted already, 
+        so the children are pushed in reverse order without sorting.
+
+        Input:  end(int), the node of the prefix
+
+        Ouput:  words(generator of strings)
+
+        Time Complexity:    O(V) for the first words, where V is the number of nodes visited
+
+        Auxiliary space Complexity:   O(h * c), where h is the height of the subtree
+
+        Space Complexity: O(1)(Input) + O(h * c)
+        """
+        stack = [end]
+        while stack:
+            current = stack.pop()
+            index = self.node_word[current]
+            if(index != NO_WORD):
+                yield self.word(index)
+            stack.extend(reversed(self.targets[self.first_edge[current]:self.first_edge[current + 1]]))
+
+
+    def save(self, path):
+        """
+        Function description:
+        Write the snapshot to another file, which is a copy of the mapped file. Saving
+        to the mapped file itself does nothing, since it holds the same data already.
+
+        Input:  path(string or path)
+
+        Ouput:  None
+
+        Time Complexity:    O(F), where F is the size of the file
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        if(os.path.exists(path) and os.path.samefile(path, self.path)):
+            return
+        with open(path, "wb") as file:
+            file.write(self.buffer)
+
+
+    def correct(self, word, max_edits = 2, k = None):
+        """
+        Function description: Same as Trie.correct.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(optional)(int), at least 0
+        argument3: k(optional)(int), maximum number of words, defaults to the ranking size
+
+        Ouput:  a list with maximum k strings, raises ValueError if max_edits is negative
+                or k is less than 1
+
+        Time Complexity:    O(V * c + S * m * s), same as Trie.correct
+
+        Auxiliary space Complexity:   O(V + S * (m + s))
+
+        Space Complexity: O(m)(Input) + O(V + S * (m + s))
+        """
+        if(max_edits < 0):
+            raise ValueError("max_edits must be at least 0")
+        if(k is None):
+            k = self.size
+        if(k < 1):
+            raise ValueError("k must be at least 1")
+
+        return [candidate[2] for candidate in self.correct_aux(word, max_edits, k)]
+
+
+    def correct_aux(self, word, max_edits, k):
+        """
+        Function description: Same as Trie.correct_aux, the nodes are the numbers of the
+        nodes of the mapped tables, and the root is 0.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(int)
+        argument3: k(int)
+
+        Ouput:  candidates(list of tuples)
+
+        Time Complexity:    O(V * c + S * m * s), same as correct_search
+
+        Auxiliary space Complexity:   O(V + S * (m + s))
+
+        Space Complexity: O(m)(Input) + O(V + S * (m + s))
+        """
+        return correct_search(word, max_edits, k, 0, self.correct_entry, self.correct_edges)
+
+
+    def correct_entry(self, node):
+        """
+        Function description: Same as Trie.correct_entry.
+
+        Input:  node(int)
+
+        Ouput:  entry(tuple) or None
+
+        Time Complexity:    O(L), where L is the length of the word
+
+        Auxiliary space Complexity:   O(L)
+
+        Space Complexity: O(1)(Input) + O(L)
+        """
+        index = self.node_word[node]
+        return None if index == NO_WORD else (self.freqs[index], self.word(index))
+
+
+    def correct_edges(self, node):
+        """
+        Function description: Same as Trie.correct_edges.
+
+        Input:  node(int)
+
+        Ouput:  edges(iterator of tuples)
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        low = self.first_edge[node]
+        high = self.first_edge[node + 1]
+        return zip(map(chr, self.labels[low:high]), self.targets[low:high])
+
+
+    def search_many(self, keys):
+        """
+        Function description:
+        Same as Trie.search_many, the keys are walked by prefix_walk.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists of strings)
+
+        Time Complexity:    O(K log K * M + K * M log c), where K is the number of keys,
+                            M is the maximum length of key and c is the maximum number 
+                            of children of a node
+
+        Auxiliary space Complexity:   O(K + M)
+
+        Space Complexity: O(K * M)(Input) + O(K + M)
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        for position, path in prefix_walk(keys, 0, self.child):
+            results[position] = self.collect(path, keys[position])
+        return results
+
+
+    def collect(self, path, key):
+        """
+        Function description:
+        Same as Trie.collect, build the result of search from the node indices on the
+        path of the key, excluding the root.
+
+        Input:
+        argument1: path(list of int)
+        argument2: key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n), where n is the length of path
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(n)(Inputs) + O(1)
+        """
+        #If the first character of string does not existed, we return empty list
+        if(len(key) > 0 and len(path) == 0):
+            return []
+
+        #The key is a word
+        if(len(path) == len(key) and self.node_word[path[-1] if path else 0] != NO_WORD):
+            return []
+
+        #Only the empty key uses the ranking of the root
+        result = []
+        for node in reversed(path or [0]):
+            if(len(result) == self.size):
+                break
+            start = node * self.size
+            for word in self.ranking[start:start + self.size]:
+                if(len(result) == self.size):
+                    break
+                if(word != NO_WORD and word not in result):
+                    result.append(word)
+
+        return [self.word(word) for word in result]
+
+
+class FrozenTrie:
+    """
+    Class for a read-only Trie in NumPy arrays, created by Trie.freeze, for offline 
+    jobs that check millions of tokens against a fixed dictionary.
+
+    The nodes are numbered in breadth first order, and the children of a node are 
+    sorted by their characters, so the edges sorted by (parent, character) link to
+    the nodes 1, 2, 3, ... in the same order, and the child of edge e is node e + 1.
+    Each edge is stored as the key parent * scale + code point of its character, 
+    where scale is larger than every code point of the Trie, so these keys are sorted
+    too, and the edge of any (parent, character) is found by numpy.searchsorted.
+    Every node stores its frequency, its word and its ranking, as indexes of words.
+
+    lookup_batch walks all tokens one level at a time: each step looks up the edges 
+    of every token that is still inside the Trie with one searchsorted call.
+    """
+    def __init__(self, trie):
+        """
+        Function description: Constructor of FrozenTrie class. The rankings of a lazy
+        Trie are computed by get_ranking, so every node of the copy has its ranking.
+
+        Input:  trie(Trie)
+
+        Ouput:  None
+
+        Time Complexity:    O(N * (c log c + k)), where N is the number of nodes and c
+                            is the maximum number of children
+        -Analysis:  The children of every node are sorted, and every ranking is copied.
+
+        Auxiliary space Complexity:  O(N * k)
+
+        Space Complexity:   O(1)(Input) + O(N * k)
+        """
+        import numpy
+
+        self.k = trie.k
+        #The root is only read once, so the copy is one version of a concurrent Trie
+        order = [trie.root]
+        parents = []
+        codes = []
+        for index, current in enumerate(order):
+            if(current.link is None):
+                continue
+            for char, child in sorted(zip(current.chars, current.link), key = lambda edge: edge[0]):
+                parents.append(index)
+                codes.append(ord(char))
+                order.append(child)
+
+        #The nodes are in breadth first order, so the last node is one of the deepest
+        self.height = order[-1].height
+
+        self.scale = max(codes, default = 0) + 1
+        self.keys = numpy.array(parents, dtype = numpy.int64) * self.scale + numpy.array(codes, dtype = numpy.int64)
+
+        #Words are found by their strings, since older copies of a node may be ranked in concurrent mode
+        words = [node.string for node in order if node.string is not None]
+        index_of = {word: index for index, word in enumerate(words)}
+        #An array of objects, so the results are converted to strings by NumPy, the index -1 is None
+        self.words = numpy.array(words + [None], dtype = object)
+        self.freq = numpy.array([node.freq for node in order], dtype = numpy.int64)
+        self.word = numpy.array([index_of.get(node.string, -1) for node in order], dtype = numpy.int32)
+
+        #The ranking of the root is only used by the empty key, which check never searches
+        ranking = [-1] * (len(order) * self.k)
+        for index in range(1, len(order)):
+            for position, node in enumerate(trie.get_ranking(order[index]) or []):
+                ranking[index * self.k + position] = index_of[node.string]
+        self.ranking = numpy.array(ranking, dtype = numpy.int32).reshape(len(order), self.k)
+
+
+    def search(self, key):
+        """
+        Function description: Same as SpellChecker.check for one key.
+
+        Input:  key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(n * log E), where n is the length of key and E is the 
+                            number of edges
+
+        Auxiliary space Complexity:   O(n)
+
+        Space Complexity: O(1)(Input) + O(n)
+        """
+        return self.lookup_batch([key])[0]
+
+
+    def lookup_batch(self, tokens, batch = 1 << 16):
+        """
+        Function description:
+        Return the result of SpellChecker.check for every token, in the same order. 
+        The tokens are looked up by lookup_aux in batches, which bounds the size of 
+        the arrays of a batch.
+
+        Input:
+        argument1: tokens(iterable of strings)
+        argument2: batch(optional)(int), number of tokens looked up together
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time Complexity:    O(Q * M * log E), where Q is the number of tokens and M is 
+                            the maximum length of token
+        -Analysis:  Same as lookup_aux, the loops run in NumPy.
+
+        Auxiliary space Complexity:   O(Q * k + B * M), where B is batch
+
+        Space Complexity: O(Q * M)(Input) + O(Q * k + B * M)
+        """
+        tokens = list(tokens)
+        results = []
+        for start in range(0, len(tokens), batch):
+            results.extend(self.lookup_aux(tokens[start:start + batch]))
+        return results
+
+
+    def lookup_aux(self, tokens):
+        """
+        Function description:
+        Look up a batch of tokens with the rules of Trie.collect:
+        1. Walk: at level i, the i-th character of every token that is still inside 
+           the Trie is looked up with one searchsorted over the keys of the edges, and 
+           the nodes of the path are recorded. A token stops at its first missing edge.
+        2. The empty results: blank tokens, tokens whose first character is missing,
+           and tokens that end at a word.
+        3. Merge: from the deepest node of each path up to the first node, the words of
+           the ranking that are not yet in the result are added until there are k 
+           words. Most tokens are done after their deepest node, so the later levels
+           only merge the remaining tokens.
+
+        Input:  tokens(list of strings)
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time Complexity:    O(B * H * log E), where B is the number of tokens and H is
+                            the smaller of the maximum length of token and the height
+                            of the Trie
+        -Analysis:  Each level of the walk is one searchsorted of at most B keys, and
+                    each level of the merge compares at most B * k words k times.
+                    No path is deeper than the Trie, so one long token does not add
+                    levels.
+
+        Auxiliary space Complexity:   O(T + B * (H + k)), where T is the number of characters
+        -Analysis:  The code points and the paths of the tokens.
+
+        Space Complexity: O(T)(Input) + O(T + B * (H + k))
+        """
+        import numpy
+
+        count = len(tokens)
+        lengths = numpy.fromiter(map(len, tokens), dtype = numpy.int64, count = count)
+        starts = numpy.cumsum(lengths) - lengths
+        codes = numpy.frombuffer("".join(tokens).encode("utf-32-le", "surrogatepass"), dtype = numpy.uint32).astype(numpy.int64)
+        #The paths are never deeper than the Trie
+        longest = min(int(lengths.max()) if count else 0, self.height)
+
+        node = numpy.zeros(count, dtype = numpy.int64)
+        depth = numpy.zeros(count, dtype = numpy.int64)
+        path = numpy.zeros((count, longest), dtype = numpy.int32)
+
+        #1.Walking every token down the Trie, one level at a time
+        rows = numpy.flatnonzero(lengths)
+        for level in range(longest):
+            rows = rows[lengths[rows] > level]
+            if(rows.size == 0 or self.keys.size == 0):
+                break
+            chars = codes[starts[rows] + level]
+            query = node[rows] * self.scale + chars
+            position = numpy.minimum(numpy.searchsorted(self.keys, query), self.keys.size - 1)
+            #A code point that is not below scale would match the key of another parent
+            found = (chars < self.scale) & (self.keys[position] == query)
+            rows = rows[found]
+            node[rows] = position[found] + 1
+            depth[rows] = level + 1
+            path[rows, level] = node[rows]
+
+        #2.The tokens with an empty result
+        blank = numpy.fromiter((token.strip() == "" for token in tokens), dtype = bool, count = count)
+        empty = blank | (depth == 0) | ((depth == lengths) & (self.word[node] >= 0))
+
+        #3.Merging the rankings from the deepest node up
+        result = numpy.full((count, self.k), -1, dtype = numpy.int32)
+        size = numpy.zeros(count, dtype = numpy.int64)
+        level = depth - 1
+        rows = numpy.flatnonzero(~empty)
+        while rows.size:
+            ranking = self.ranking[path[rows, level[rows]]]
+            for column in range(self.k):
+                candidate = ranking[:, column]
+                fresh = ((candidate >= 0) & (size[rows] < self.k) & 
+                         ~(result[rows] == candidate[:, None]).any(axis = 1))
+                added = rows[fresh]
+                result[added, size[added]] = candidate[fresh]
+                size[added] += 1
+            level[rows] -= 1
+            rows = rows[(level[rows] >= 0) & (size[rows] < self.k)]
+
+        results = self.words[result].tolist()
+        for row in numpy.flatnonzero(size < self.k).tolist():
+            del results[row][size[row]:]
+        return results
+
+
+#A token is a maximal run of alphanumeric characters. 
+#[^\W_] matches exactly the characters where str.isalnum() is True.
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+#Ascii bytes that can not be part of a token. In utf-8, bytes of multi-byte
+#characters are never ascii, so a file can be split safely at these bytes.
+DELIMITER_PATTERN = re.compile(rb"[\x00-\x2f\x3a-\x40\x5b-\x60\x7b-\x7f]")
+
+
+def tokenize(source, chunk_size = 1 << 20, encoding = "utf-8"):
+    """
+    Function description:
+    Generator that yields every token of the source. A token is a maximal run of
+    characters where char.isalpha() or char.isdigit() is True.
+
+    The source can be a path, a file-like object with a read method that returns
+    strings, or any iterable of strings such as a list of lines. Files are read in
+    buffers of chunk_size characters instead of line by line, and a token may span
+    two buffers, see tokenize_chunks. Every string of an iterable is a separate 
+    piece of text, like the lines of a file, so no token continues from one string
+    to the next. Use tokenize_chunks for an iterable of consecutive pieces of the 
+    same text.
+
+    The strings are split with a compiled regular expression. Ascii strings are
+    yielded directly, otherwise every token is checked by tokenize_aux, and only
+    tokens that are not purely alphabetic are checked character by character, 
+    because numeric characters that are not digits (such as '\u00bd') are not
+    part of a token.
+
+    Input:
+    argument1: source(string, path, file-like object or iterable of strings)
+    argument2: chunk_size(optional)(int)
+    argument3: encoding(optional)(string), used when source is a path, the default
+               is the same as parallel_count_tokens instead of the locale
+
+    Ouput:  generator of tokens(string)
+
+    Time Complexity:    O(T), where T is the number of characters of the source
+    -Analysis:  Same as tokenize_chunks.
+
+    Auxiliary space Complexity:   O(C), where C is the chunk_size or the maximum 
+                                  length of the strings of an iterable
+
+    Space Complexity: O(1)(Input) + O(C)
+    """
+    if(isinstance(source, (str, os.PathLike))):
+        with open(source, "r", encoding = encoding) as file:
+            yield from tokenize(file, chunk_size)
+        return
+
+    if(hasattr(source, "read")):
+        yield from tokenize_chunks(iter(lambda: source.read(chunk_size), ""))
+        return
+
+    for piece in source:
+        tokens = TOKEN_PATTERN.findall(piece)
+        if(piece.isascii()):
+            yield from tokens
+        else:
+            for token in tokens:
+                yield from tokenize_aux(token)
+
+
+def tokenize_chunks(chunks):
+    """
+    Function description:
+    Generator that yields every token of a text that is given as consecutive chunks, 
+    such as the buffers of a file. Same as tokenize, but the last token of a chunk is
+    held back until the next chunk arrives, because it may continue in the next chunk.
+
+    Input:  chunks(iterable of strings)
+
+    Ouput:  generator of tokens(string)
+
+    Time Complexity:    O(T), where T is the number of characters of the chunks
+    -Analysis:  Each character is scanned once by the regular expression, except 
+                the last token of a chunk, which is scanned again with the next chunk.
+
+    Auxiliary space Complexity:   O(C), where C is the maximum size of chunk
+    -Analysis:  Only one chunk and the held back token are kept.
+
+    Space Complexity: O(1)(Input) + O(C)
+    """
+    tail = ""
+    for chunk in chunks:
+        if(tail):
+            chunk = tail + chunk
+            tail = ""
+
+        tokens = TOKEN_PATTERN.findall(chunk)
+
+        #The last token touches the end of the buffer, so it may continue in the next buffer
+        if(chunk[-1:].isalnum()):
+            tail = tokens.pop()
+
+        if(chunk.isascii()):
+            yield from tokens
+        else:
+            for token in tokens:
+                yield from tokenize_aux(token)
+
+    if(tail):
+        yield from tokenize_aux(tail)
+
+
+def tokenize_aux(token):
+    """
+    Function description:
+    Auxiliary function of tokenize. Yields the token itself when all of its characters
+    are letters or digits, otherwise splits it at the characters that are neither.
+
+    Input:  token(string)
+
+    Ouput:  generator of tokens(string)
+
+    Time Complexity:    O(n), where n is the length of token
+
+    Auxiliary space Complexity:   O(n), where n is the length of token
+
+    Space Complexity: O(n)(Input) + O(n)
+    """
+    #Ascii alphanumeric characters are always letters or digits
+    if(token.isascii() or token.isalpha()):
+        yield token
+        return
+
+    word = []
+    for char in token:
+        if(char.isalpha() or char.isdigit()):
+            word.append(char)
+        elif(len(word) != 0):
+            yield "".join(word)
+            word = []
+
+    if(len(word) != 0):
+        yield "".join(word)
+
+
+def count_tokens(source, chunk_size = 1 << 20, encoding = "utf-8"):
+    """
+    Function description:
+    Count the frequency of every token of the source.
+
+    Input:
+    argument1: source(string, path, file-like object or iterable of strings)
+    argument2: chunk_size(optional)(int)
+    argument3: encoding(optional)(string), used when source is a path
+
+    Ouput:  counts(collections.Counter)
+
+    Time Complexity:    O(T), where T is the number of characters of the source
+
+    Auxiliary space Complexity:   O(N), where N is the total length of distinct tokens
+
+    Space Complexity: O(1)(Input) + O(N)
+    """
+    return Counter(tokenize(source, chunk_size, encoding))
+
+
+def split_file(path, pieces, chunk_size = 1 << 16):
+    """
+    Function description:
+    Split a file into at most pieces byte ranges of similar size. Every boundary 
+    is moved forward to the next ascii delimiter byte, so no token is split 
+    between two ranges and every range can be decoded on its own.
+
+    Input:
+    argument1: path(string or path)
+    argument2: pieces(int)
+    argument3: chunk_size(optional)(int), bytes read while looking for a delimiter
+
+    Ouput:  ranges(list of (start, end) tuples)
+
+    Time Complexity:    O(P), where P is the pieces
+    -Analysis:  Each boundary only reads until the next delimiter byte, which is 
+                usually within the first block read.
+
+    Auxiliary space Complexity:   O(P), where P is the pieces
+
+    Space Complexity: O(1)(Input) + O(P)
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+
+    with open(path, "rb") as file:
+        for i in range(1, pieces):
+            position = max(size * i // pieces, boundaries[-1])
+
+            #Looking for the next delimiter byte
+            file.seek(position)
+            while position < size:
+                data = file.read(chunk_size)
+                match = DELIMITER_PATTERN.search(data)
+                if(match):
+                    position += match.start()
+                    break
+                position += len(data)
+
+            if(position >= size):
+                break
+            if(position > boundaries[-1]):
+                boundaries.append(position)
+
+    boundaries.append(size)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+def count_tokens_range(path, start, end, encoding = "utf-8", chunk_size = 1 << 20):
+    """
+    Function description:
+    Count the tokens inside the byte range [start, end) of a file. The range is read 
+    in blocks of chunk_size bytes and decoded incrementally, so a character split 
+    between two blocks is decoded correctly.
+
+    Input:
+    argument1: path(string or path)
+    argument2: start(int)
+    argument3: end(int)
+    argument4: encoding(optional)(string)
+    argument5: chunk_size(optional)(int)
+
+    Ouput:  counts(collections.Counter)
+
+    Time Complexity:    O(B), where B is end - start
+
+    Auxiliary space Complexity:   O(C + N), where C is the chunk_size and N is the 
+                                  total length of distinct tokens
+
+    Space Complexity: O(1)(Input) + O(C + N)
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    def chunks():
+        with open(path, "rb") as file:
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                data = file.read(min(chunk_size, remaining))
+                if(not data):
+                    break
+                remaining -= len(data)
+                yield decoder.decode(data)
+        yield decoder.decode(b"", True)
+
+    return Counter(tokenize_chunks(chunks()))
+
+
+def parallel_count_tokens(source, processes = None, encoding = "utf-8"):
+    """
+    Function description:
+    Count the tokens of one or more files with a pool of processes. Every file is
+    split by split_file into byte ranges aligned to token boundaries, the ranges 
+    are counted by count_tokens_range in the worker processes, and the partial
+    frequency tables are merged.
+
+    The encoding must be one where ascii bytes only represent ascii characters, 
+    such as utf-8, so the files can be split at any ascii delimiter.
+
+    Input:
+    argument1: source(path or list of paths)
+    argument2: processes(optional)(int), defaults to the number of cpus
+    argument3: encoding(optional)(string)
+
+    Ouput:  counts(collections.Counter)
+
+    Time Complexity:    O(T / P + N), where T is the number of characters of the files, 
+                        P is the number of processes and N is the total length of 
+                        the distinct tokens of all partial tables
+    -Analysis:  Each process tokenizes about T / P characters, and merging the 
+                partial tables loops through each of their tokens once.
+
+    Auxiliary space Complexity:   O(N)
+
+    Space Complexity: O(1)(Input) + O(N)
+    """
+    if(isinstance(source, (str, os.PathLike))):
+        source = [source]
+    if(processes is None):
+        processes = os.cpu_count() or 1
+
+    #Several ranges per process, so a process finishing early can take another range
+    total_size = sum(os.path.getsize(path) for path in source)
+    target = max(total_size // (processes * 4), 1 << 20)
+
+    tasks = []
+    for path in source:
+        pieces = max(os.path.getsize(path) // target, 1)
+        for start, end in split_file(path, pieces):
+            tasks.append((path, start, end, encoding))
+
+    counts = Counter()
+    if(processes == 1 or len(tasks) == 1):
+        for task in tasks:
+            counts.update(count_tokens_range(*task))
+        return counts
+
+    with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+        for partial in pool.starmap(count_tokens_range, tasks):
+            counts.update(partial)
+    return counts
+
+
+def shard_of(key, depth, shards):
+    """
+    Function description:
+    Return the shard of key for ShardedSpellChecker, from the crc32 of its first depth
+    characters. Unlike hash, crc32 is the same in every process, and every word that 
+    starts with the same depth characters is in the same shard.
+
+    Input:
+    argument1: key(string)
+    argument2: depth(int)
+    argument3: shards(int)
+
+    Ouput:  shard(int)
+
+    Time Complexity:    O(depth)
+
+    Auxiliary space Complexity:   O(depth)
+
+    Space Complexity: O(1)(Input) + O(depth)
+    """
+    return zlib.crc32(key[:depth].encode("utf-8", "surrogatepass")) % shards
+
+
+def shard_worker(connection, depth, options):
+    """
+    Function description:
+    Main loop of a shard process of ShardedSpellChecker. The first message is the 
+    frequency table of the shard, which is built into a Trie, and the rankings of 
+    the prefixes shorter than depth are sent back by shallow_rankings. If the Trie 
+    can not be built, the exception is sent instead and the process stops. Every next 
+    message is (op, keys), which is answered by the list of results of the keys, or 
+    by the exception if one is raised. None, or the end of the pipe, stops the process.
+
+    Input:
+    argument1: connection(multiprocessing.connection.Connection)
+    argument2: depth(int)
+    argument3: options(dict), keyword arguments of Trie
+
+    Ouput:  None
+
+    Time Complexity:    O(N + R), where N is the total length of the words of the 
+                        shard and R is the time of the requests
+
+    Auxiliary space Complexity:   O(N)
+
+    Space Complexity: O(1)(Input) + O(N)
+    """
+    try:
+        trie = Trie.from_counts(connection.recv(), **options)
+        rankings = shallow_rankings(trie, depth)
+    except Exception as error:
+        connection.send(error)
+        connection.close()
+        return
+    connection.send(rankings)
+
+    while True:
+        #The pipe is closed without None if the coordinator exits first
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if(message is None):
+            break
+
+        op, keys = message
+        try:
+            if(op == "search"):
+                result = [shard_search(trie, key, depth) for key in keys]
+            else:
+                result = trie.complete_many(keys)
+        except Exception as error:
+            result = error
+        connection.send(result)
+
+    connection.close()
+
+
+def shallow_rankings(trie, depth):
+    """
+    Function description:
+    Return the ranking and the frequency of every prefix of the Trie that is shorter 
+    than depth, except the empty prefix. These prefixes can be shared by several 
+    shards, so ShardedSpellChecker merges them.
+
+    Input:
+    argument1: trie(Trie)
+    argument2: depth(int)
+
+    Ouput:  table(dict of string to (list of (frequency, word), frequency))
+
+    Time Complexity:    O(P * k), where P is the number of prefixes shorter than depth
+
+    Auxiliary space Complexity:   O(P * k)
+
+    Space Complexity: O(1)(Input) + O(P * k)
+    """
+    table = {}
+    stack = [(trie.root, "")]
+    while stack:
+        current, prefix = stack.pop()
+        if(prefix != ""):
+            ranking = trie.get_ranking(current) or []
+            table[prefix] = ([(node.freq, node.string) for node in ranking], current.freq)
+        if(len(prefix) < depth - 1 and current.link is not None):
+            stack.extend((child, prefix + char) for char, child in zip(current.chars, current.link))
+    return table
+
+
+def shard_search(trie, key, depth):
+    """
+    Function description:
+    The part of search that the shard of key can answer, for a key that is not 
+    shorter than depth. Same as Trie.collect, but only the rankings of the nodes 
+    of depth or deeper are merged, because only they are complete in the shard.
+
+    Input:
+    argument1: trie(Trie)
+    argument2: key(string)
+    argument3: depth(int)
+
+    Ouput:  (length of the path(int), key is a word(bool), list with maximum k strings)
+
+    Time Complexity:    O(n * k^2), where n is the length of key
+
+    Auxiliary space Complexity:   O(n), where n is the length of key
+
+    Space Complexity: O(1)(Input) + O(n)
+    """
+    path = trie.walk(key)
+    if(len(path) == len(key) and path[-1].string is not None):
+        return len(path), True, []
+
+    result = []
+    for current in reversed(path[depth - 1:]):
+        if(len(result) == trie.k):
+            break
+        for node in trie.get_ranking(current) or []:
+            if(len(result) == trie.k):
+                break
+            if(node.string not in result):
+                result.append(node.string)
+    return len(path), False, result
+
+
+class SpellChecker:
+    """
+    Class of SpellChecker 
+    """
+    def __init__(self, source, radix = False, **options):
+        """
+        Function description: Constructor of SpellChecker class
+
+        Input:  
+        argument1: source(string, path, file-like object or iterable of strings)
+        argument2: radix(optional)(bool), if True, a RadixTrie is used instead of Trie
+        argument3: options(optional), keyword arguments of Trie, such as cache_size
+
+        Ouput:  None
+
+        Time complexity: O(T), where T is the number of characters of the source
+        -Analysis:  T is the number of character of the source
+
+                    1. Tokenizing and counting the source:      O(T)
+                    2. Building the trie from the counts:       O(T)
+                        
+                    Total: O(T) + O(T) = O(T)
+
+        Auxiliary Space Complexity: O(T), where T is the number of character of the source.
+        -Analysis:  In worst case, every token is distinct, so the frequency table and
+                    the trie take T spaces.
+
+        Space Complexity: O(1)(Input) + O(T), where T is the number of character of the source.
+
+        """
+        #Creating the Trie from the frequency table of the tokens
+        self.trie = (RadixTrie if radix else Trie).from_counts(count_tokens(source), **options)
+
+
+    @classmethod
+    def from_counts(cls, mapping, radix = False, **options):
+        """
+        Function description: Create a SpellChecker from a pre-aggregated frequency table
+        instead of a file.
+
+        Input:  
+        argument1: mapping(dict of string to int)
+        argument2: radix(optional)(bool), if True, a RadixTrie is used instead of Trie
+        argument3: options(optional), keyword arguments of Trie
+
+        Ouput:  spell_checker(SpellChecker)
+
+        Time complexity: O(N), where N is the total length of distinct words
+        -Analysis:  Same as Trie.from_counts
+
+        Auxiliary Space Complexity: O(N), where N is the total length of distinct words
+
+        Space Complexity: O(W)(Input) + O(N), where W is the size of the mapping
+        """
+        checker = cls.__new__(cls)
+        checker.trie = (RadixTrie if radix else Trie).from_counts(mapping, **options)
+        return checker
+
+
+    @classmethod
+    def from_files(cls, source, processes = None, encoding = "utf-8", **options):
+        """
+        Function description: Create a SpellChecker from one or more files, counting 
+        the tokens with a pool of processes by parallel_count_tokens. The result is 
+        the same as SpellChecker(path) for a single file.
+
+        Input:
+        argument1: source(path or list of paths)
+        argument2: processes(optional)(int), defaults to the number of cpus
+        argument3: encoding(optional)(string)
+        argument4: options(optional), keyword arguments of from_counts, such as radix
+
+        Ouput:  spell_checker(SpellChecker)
+
+        Time complexity: O(T / P + N), where T is the number of characters of the files,
+                         P is the number of processes and N is the total length of 
+                         distinct tokens
+        -Analysis:  Same as parallel_count_tokens, plus Trie.from_counts takes O(N)
+
+        Auxiliary Space Complexity: O(N)
+
+        Space Complexity: O(1)(Input) + O(N)
+        """
+        return cls.from_counts(parallel_count_tokens(source, processes, encoding), **options)
+
+
+    @classmethod
+    def load(cls, path):
+        """
+        Function description: Create a SpellChecker from a snapshot file written by 
+        SpellChecker.save or Trie.save, without reading the corpus again.
+
+        Input:  path(string or path)
+
+        Ouput:  spell_checker(SpellChecker)
+
+        Time complexity: O(1)
+        -Analysis:  Same as Trie.load
+
+        Auxiliary Space Complexity: O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        checker = cls.__new__(cls)
+        checker.trie = Trie.load(path)
+        return checker
+
+
+    def save(self, path):
+        """
+        Function description: Write the Trie of this SpellChecker to a snapshot file.
+
+        Input:  path(string or path)
+
+        Ouput:  None
+
+        Time complexity: O(N), where N is the number of nodes
+        -Analysis:  Same as Trie.save
+
+        Auxiliary Space Complexity: O(N + S), where S is the total length of the words
+
+        Space Complexity: O(1)(Input) + O(N + S)
+        """
+        self.trie.save(path)
+                   
+                    
+    def check(self, key):
+        """
+        Function description: 
+        This function will take a key as argument and search through the Trie.After that,
+        it will return a list that contains maximum k words(3 by default) that meets some criterias or 
+        an empty list.
+        
+        Approach description:
+        We decide to add an attribute to the Node, which is a list(I call it ranking) that contains maximum k words base on 3 criterias.
+        Therefore, we can get the top k words easily when we are searching for it, do not need to traverse the entire trie.
+
+        When we are reading the file, we insert the words to our trie by walking down the key and keeping a stack of the nodes on the path.
+        After that, the stack is popped from the terminal node back to the first node, like returning from a recursion, and each node gets a pointer to the terminal node. The reason we want the pointer to terminal node instead of word itself, is 
+        the space complexity of the pointer is O(1), unlike word will take n spaces, where n is the length of word. Besides that, terminal node
+        can store more information, such as the frequency, which we cannot know from the word. Therefore, it is logical to store the pointer to the
+        terminal node inside the ranking. Besides that, each node has an attribute called height, so we can know the index of characters we should compare 
+        at that node.
+
+        When we are popping the stack with the pointer to terminal node, each node will compare this pointer to those pointer(s) inside the ranking. The ranking
+        always stays sorted by an ordering key (rank_key), which is the negative frequency and the word itself. Comparing two keys compares the frequency first,
+        then the strings, and Python compares strings by their ascii values, where a shorter word comes before a longer word with the same prefix. Since the
+        ranking is sorted, we can find the old position of the pointer and the new position of the pointer using binary search, which takes O(log k) comparisons
+        where k is the size of ranking. If the pointer is not inside the ranking and the ranking is full, we only compare it to the last pointer, which is the
+        worst pointer of the ranking.
+
+        This process will make our searching easier. Because we just need to search until the end of key or encounter the node does not exist, we just get the current node's ranking
+        as the returning list and returning back. If the returning list's size is lesser than k, we get the pointers from the nearer node's ranking until it is full.
+
+        After that, we use a for-loop, to change the pointer to the word they stored and return this list of strings.
+
+        Input:  key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time complexity: O(M), where M is the length of key
+        -Analysis:  In worst case, the key is inside the Trie, so we need to 
+                    search until the end of key.
+
+                    M is the length of key
+                    1. Using strip to check key is empty or not:      O(M)
+                    2. Using search function of trie:                 O(M)
+
+                    Total: O(M) + O(M)  = O(2M)
+                                        = O(M)
+                        
+        Auxiliary Space Complexity: O(M), where M is the length of key
+        -Analysis:  Same as before, the worst case is the key is inside the Trie,
+                    so the path of the search keeps M nodes.
+
+        Space Complexity:O(1)(Input) + O(M), where M is the length of key
+        """
+        if(key.strip() == ""):
+            return []
+
+        checking = self.trie.search(key) 
+
+        return checking
+
+
+    def check_many(self, keys):
+        """
+        Function description: 
+        Same as check, but for a batch of keys. The keys are searched together by 
+        search_many, which reuses the traversal of prefixes shared by the keys.
+        The results are in the same order as the keys.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time complexity: O(K log K * M), where K is the number of keys and M is the 
+                         maximum length of key
+        -Analysis:  Same as Trie.search_many
+
+        Auxiliary Space Complexity: O(K + M)
+
+        Space Complexity: O(K * M)(Input) + O(K + M)
+        """
+        keys = list(keys)
+        results = self.trie.search_many(keys)
+
+        for i in range(len(keys)):
+            if(keys[i].strip() == ""):
+                results[i] = []
+
+        return results
+
+
+    def complete(self, key):
+        """
+        Function description: 
+        Return the k most frequent words that start with key, including key itself,
+        for prefix queries. See Trie.complete.
+
+        Input:  key(string)
+
+        Ouput:  a list with maximum k strings
+
+        Time complexity: O(M), where M is the length of key
+
+        Auxiliary Space Complexity: O(M), where M is the length of key
+
+        Space Complexity:O(1)(Input) + O(M), where M is the length of key
+        """
+        if(key.strip() == ""):
+            return []
+
+        return self.trie.complete(key)
+
+
+    def complete_many(self, keys):
+        """
+        Function description: 
+        Same as complete, but for a batch of keys, which are looked up together by
+        complete_many of the Trie. The results are in the same order as the keys.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time complexity: O(K log K * M), where K is the number of keys and M is the 
+                         maximum length of key
+
+        Auxiliary Space Complexity: O(K + M)
+
+        Space Complexity: O(K * M)(Input) + O(K + M)
+        """
+        keys = list(keys)
+        results = self.trie.complete_many(keys)
+
+        for i in range(len(keys)):
+            if(keys[i].strip() == ""):
+                results[i] = []
+
+        return results
+
+
+    def iter_prefix(self, key, order = "rank"):
+        """
+        Function description:
+        Return an iterator over every word that starts with key, for suggestion lists
+        that load more words as they scroll, e.g. the next page is 
+        list(itertools.islice(words, 20)). See Trie.iter_prefix.
+
+        Input:
+        argument1: key(string)
+        argument2: order(optional)(string), "rank" or "lex"
+
+        Ouput:  words(iterator of strings)
+
+        Time complexity: O(M), where M is the length of key, the words are found by the
+                         iterator
+
+        Auxiliary Space Complexity: O(M), where M is the length of key
+
+        Space Complexity:O(1)(Input) + O(M), where M is the length of key
+        """
+        if(key.strip() == ""):
+            return iter(())
+
+        return self.trie.iter_prefix(key, order)
+
+
+    def correct(self, word, max_edits = 2, k = None):
+        """
+        Function description:
+        Return the closest words to word, allowing typos anywhere in the word, including
+        the first characters. The words are ranked by smaller edit distance, then higher 
+        frequency, then lower ascii value. See Trie.correct.
+
+        Input:
+        argument1: word(string)
+        argument2: max_edits(optional)(int), at least 0
+        argument3: k(optional)(int), maximum number of words, defaults to the k of the Trie
+
+        Ouput:  a list with maximum k strings, raises ValueError if max_edits is negative
+                or k is less than 1
+
+        Time complexity: O(V * m), where V is the number of nodes visited and m is the 
+                         length of word
+
+        Auxiliary Space Complexity: O(V * m)
+
+        Space Complexity: O(m)(Input) + O(V * m)
+        """
+        #The arguments are checked even when the word is blank
+        if(max_edits < 0):
+            raise ValueError("max_edits must be at least 0")
+        if(k is not None and k < 1):
+            raise ValueError("k must be at least 1")
+        if(word.strip() == ""):
+            return []
+
+        return self.trie.correct(word, max_edits, k)
+
+
+
+class ShardedSpellChecker:
+    """
+    Class of SpellChecker whose words are split across worker processes.
+
+    Every word goes to the shard given by shard_of, the crc32 of its first depth 
+    characters, and every shard process builds its own Trie, so the Tries of the 
+    shards use the memory and the cores of several processes. The rankings of the 
+    nodes of depth or deeper only have words of one shard, but the prefixes shorter 
+    than depth are shared by the shards, so their merged rankings are kept by this 
+    process, the coordinator, in a small table.
+
+    check sends the key to its shard, which merges the rankings of the path from the
+    deepest node up to depth, and the coordinator adds the rankings of the shorter
+    prefixes from the table, so the results are the same as SpellChecker.check. The
+    keys of check_many are sent to all shards at once and answered in parallel. 
+    Only check, check_many and complete are supported, the words can not be changed.
+    """
+    def __init__(self, source, shards = None, depth = 2, **options):
+        """
+        Function description: Constructor of ShardedSpellChecker class
+
+        Input:
+        argument1: source(string, path, file-like object or iterable of strings)
+        argument2: shards(optional)(int), number of processes, defaults to the number of cpus
+        argument3: depth(optional)(int), number of first characters that choose the shard
+        argument4: options(optional), keyword arguments of Trie
+
+        Ouput:  None
+
+        Time complexity: O(T + N / S), where T is the number of characters of the source,
+                         N is the total length of distinct tokens and S is shards
+        -Analysis:  The tokens are counted here, and the shards build their Tries in parallel.
+
+        Auxiliary Space Complexity: O(W + P * k), where W is the number of distinct
+                                    tokens and P is the number of prefixes shorter than depth
+
+        Space Complexity: O(1)(Input) + O(W + P * k)
+        """
+        self.start(count_tokens(source), shards, depth, options)
+
+
+    @classmethod
+    def from_counts(cls, mapping, shards = None, depth = 2, **options):
+        """
+        Function description: Create a ShardedSpellChecker from a pre-aggregated 
+        frequency table instead of a file.
+
+        Input:
+        argument1: mapping(dict of string to int)
+        argument2: shards(optional)(int)
+        argument3: depth(optional)(int)
+        argument4: options(optional), keyword arguments of Trie
+
+        Ouput:  spell_checker(ShardedSpellChecker)
+
+        Time complexity: O(W + N / S), where W is the size of the mapping
+
+        Auxiliary Space Complexity: O(W + P * k)
+
+        Space Complexity: O(W)(Input) + O(W + P * k)
+        """
+        checker = cls.__new__(cls)
+        checker.start(mapping, shards, depth, options)
+        return checker
+
+
+    @classmethod
+    def from_files(cls, source, processes = None, encoding = "utf-8", **options):
+        """
+        Function description: Create a ShardedSpellChecker from one or more files, 
+        counting the tokens with parallel_count_tokens.
+
+        Input:
+        argument1: source(path or list of paths)
+        argument2: processes(optional)(int), processes of the count, defaults to the number of cpus
+        argument3: encoding(optional)(string)
+        argument4: options(optional), keyword arguments of from_counts, such as shards
+
+        Ouput:  spell_checker(ShardedSpellChecker)
+
+        Time complexity: O(T / P + N / S)
+
+        Auxiliary Space Complexity: O(W + P * k)
+
+        Space Complexity: O(1)(Input) + O(W + P * k)
+        """
+        return cls.from_counts(parallel_count_tokens(source, processes, encoding), **options)
+
+
+    def start(self, mapping, shards, depth, options):
+        """
+        Function description:
+        Start the shard processes, send every shard its part of the mapping, and merge 
+        the rankings of the short prefixes of the shards into the table. The processes
+        are started before the mapping is split, so a forked process does not copy 
+        the parts of the other shards. The options are checked by creating an empty
+        Trie before any process is started. If a shard fails to build its Trie, every
+        shard is stopped and the exception of the shard is raised.
+
+        Input:
+        argument1: mapping(dict of string to int)
+        argument2: shards(int) or None
+        argument3: depth(int)
+        argument4: options(dict), keyword arguments of Trie
+
+        Ouput:  None, raises the exception of Trie for invalid options, or of the shard
+                that failed
+
+        Time complexity: O(W + N / S)
+
+        Auxiliary Space Complexity: O(W + P * k)
+
+        Space Complexity: O(W)(Input) + O(W + P * k)
+        """
+        if(shards is None):
+            shards = os.cpu_count() or 1
+        if(shards < 1 or depth < 1):
+            raise ValueError("shards and depth must be at least 1")
+        #Invalid options raise here instead of inside every shard
+        Trie(**options)
+
+        self.depth = depth
+        self.k = options.get("k", 3)
+        #The pipes are not shared by concurrent calls
+        self.lock = threading.Lock()
+        self.connections = []
+        self.processes = []
+        for _ in range(shards):
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target = shard_worker, args = (child_connection, depth, options), daemon = True)
+            process.start()
+            child_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        parts = [{} for _ in range(shards)]
+        for key, freq in mapping.items():
+            if(freq > 0):
+                parts[shard_of(key, depth, shards)][key] = freq
+        for connection, part in zip(self.connections, parts):
+            connection.send(part)
+        del parts
+
+        #Every shard is read, even after an error, so no shard is left blocked on its pipe
+        answers = []
+        failure = None
+        for connection in self.connections:
+            try:
+                answer = connection.recv()
+            except EOFError:
+                answer = RuntimeError("a shard process exited before its Trie was built")
+            if(isinstance(answer, Exception)):
+                failure = failure or answer
+            else:
+                answers.append(answer)
+        if(failure is not None):
+            self.close()
+            raise failure
+
+        #Merging the rankings and the frequencies of the prefixes shared by the shards
+        merged = {}
+        for answer in answers:
+            for prefix, (ranking, freq) in answer.items():
+                candidates, total = merged.get(prefix, ([], 0))
+                candidates.extend(ranking)
+                merged[prefix] = (candidates, total + freq)
+
+        self.table = {}
+        for prefix, (candidates, freq) in merged.items():
+            candidates.sort(key = lambda candidate: (-candidate[0], candidate[1]))
+            self.table[prefix] = ([word for _, word in candidates[:self.k]], freq > 0)
+
+
+    def close(self):
+        """
+        Function description: Stop the shard processes.
+
+        Input:  None
+
+        Ouput:  None
+
+        Time Complexity:    O(S), where S is the number of shards
+
+        Auxiliary space Complexity:  O(1)
+
+        Space Complexity:   O(1)
+        """
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+
+    def scatter(self, op, keys):
+        """
+        Function description:
+        Send every key to its shard, one message per shard, then gather the answers of
+        the shards and return the results in the same order as the keys. The shards
+        answer their keys in parallel.
+
+        Input:
+        argument1: op(string), "search" or "complete"
+        argument2: keys(list of strings)
+
+        Ouput:  results(list)
+
+        Time Complexity:    O(K * M + R / S), where K is the number of keys, M is the 
+                            maximum length of key and R is the time of the requests
+        -Analysis:  The keys and the results are pickled through the pipes.
+
+        Auxiliary space Complexity:   O(K)
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        groups = [[] for _ in self.connections]
+        for position, key in enumerate(keys):
+            groups[shard_of(key, self.depth, len(self.connections))].append(position)
+
+        results = [None] * len(keys)
+        failure = None
+        with self.lock:
+            for connection, group in zip(self.connections, groups):
+                if(group):
+                    connection.send((op, [keys[position] for position in group]))
+
+            #Every shard is read, even after an error, so no answer is left in a pipe
+            for connection, group in zip(self.connections, groups):
+                if(group):
+                    answer = connection.recv()
+                    if(isinstance(answer, Exception)):
+                        failure = answer
+                        continue
+                    for position, result in zip(group, answer):
+                        results[position] = result
+
+        if(failure is not None):
+            raise failure
+        return results
+
+
+    def merge(self, key, length, is_word, result):
+        """
+        Function description:
+        Finish the search of key with the rankings of the prefixes shorter than depth,
+        same as Trie.collect. length is the length of the path of key in its shard, 
+        is_word and result are the answer of shard_search, or 0, False and an empty 
+        list for a key that is shorter than depth.
+
+        Input:
+        argument1: key(string)
+        argument2: length(int)
+        argument3: is_word(bool)
+        argument4: result(list of strings)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time Complexity:    O(depth * k^2)
+
+        Auxiliary space Complexity:   O(k)
+
+        Space Complexity: O(k)(Input) + O(k)
+        """
+        if(is_word):
+            return []
+
+        #The deepest prefix shorter than depth that is a node
+        if(length >= self.depth):
+            end = self.depth - 1
+        else:
+            end = min(len(key), self.depth - 1)
+            while end > 0 and key[:end] not in self.table:
+                end -= 1
+            if(end == 0):
+                return []
+            if(end == len(key) and self.table[key][1]):
+                return []
+
+        for size in range(end, 0, -1):
+            for word in self.table[key[:size]][0]:
+                if(len(result) == self.k):
+                    break
+                if(word not in result):
+                    result.append(word)
+        return result
+
+
+    def check(self, key):
+        """
+        Function description: Same as SpellChecker.check, the key is sent to its shard 
+        if it is not shorter than depth.
+
+        Input:  key(string)
+
+        Ouput:  empty list or a list with maximum k strings
+
+        Time complexity: O(M + R), where M is the length of key and R is the round trip
+                         to the shard
+
+        Auxiliary Space Complexity: O(M)
+
+        Space Complexity: O(1)(Input) + O(M)
+        """
+        return self.check_many([key])[0]
+
+
+    def check_many(self, keys):
+        """
+        Function description: Same as SpellChecker.check_many, the keys are scattered 
+        to their shards, which search them in parallel.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time complexity: O(K * M + R / S), where K is the number of keys
+
+        Auxiliary Space Complexity: O(K)
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        keys = list(keys)
+        results = [[] for _ in keys]
+        sent = [position for position, key in enumerate(keys) if key.strip() != "" and len(key) >= self.depth]
+        answers = self.scatter("search", [keys[position] for position in sent])
+        for position, answer in zip(sent, answers):
+            results[position] = self.merge(keys[position], *answer)
+
+        for position, key in enumerate(keys):
+            if(key.strip() != "" and len(key) < self.depth):
+                results[position] = self.merge(key, 0, False, [])
+        return results
+
+
+    def complete(self, key):
+        """
+        Function description: Same as SpellChecker.complete. A key shorter than depth 
+        is answered by the table, a longer key by its shard.
+
+        Input:  key(string)
+
+        Ouput:  a list with maximum k strings
+
+        Time complexity: O(M + R), where M is the length of key
+
+        Auxiliary Space Complexity: O(M)
+
+        Space Complexity:O(1)(Input) + O(M)
+        """
+        if(key.strip() == ""):
+            return []
+        if(len(key) < self.depth):
+            return list(self.table.get(key, ([], False))[0])
+        return self.scatter("complete", [key])[0]
+
+
+    def complete_many(self, keys):
+        """
+        Function description: Same as complete, but the keys that are not shorter than
+        depth are sent together, so every shard gets one message for the whole batch.
+
+        Input:  keys(iterable of strings)
+
+        Ouput:  results(list of lists with maximum k strings)
+
+        Time complexity: Same as scatter
+
+        Auxiliary Space Complexity: O(K), where K is the number of keys
+
+        Space Complexity: O(K * M)(Input) + O(K)
+        """
+        keys = list(keys)
+        results = [[] for _ in keys]
+        long_keys = []
+        for position, key in enumerate(keys):
+            if(key.strip() == ""):
+                continue
+            if(len(key) < self.depth):
+                results[position] = list(self.table.get(key, ([], False))[0])
+            else:
+                long_keys.append(position)
+
+        if(long_keys):
+            answers = self.scatter("complete", [keys[position] for position in long_keys])
+            for position, answer in zip(long_keys, answers):
+                results[position] = answer
+
+        return results
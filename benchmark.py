@@ -0,0 +1,354 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import accumulate
+
+from Autocorrect import SpellChecker, Trie, count_tokens
+from server import percentiles
+
+
+def make_vocabulary(words, alphabet, seed = 0, min_length = 2, max_length = 12):
+    """
+    Function description:
+    Return a list of distinct random words, the first word is the most frequent one.
+
+    Input:
+    argument1: words(int), number of distinct words
+    argument2: alphabet(string)
+    argument3: seed(optional)(int)
+    argument4: min_length(optional)(int)
+    argument5: max_length(optional)(int)
+
+    Ouput:  vocabulary(list of strings)
+
+    Time Complexity:    O(W * L), where W is the number of words and L is max_length
+
+    Auxiliary space Complexity:   O(W * L)
+
+    Space Complexity: O(1)(Input) + O(W * L)
+    """
+    generator = random.Random(seed)
+    vocabulary = []
+    seen = set()
+    while len(vocabulary) < words:
+        word = "".join(generator.choice(alphabet) for _ in range(generator.randint(min_length, max_length)))
+        if(word not in seen):
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+
+def write_corpus(path, vocabulary, tokens, exponent = 1.1, seed = 0, line_length = 12):
+    """
+    Function description:
+    Write a corpus of tokens drawn from the vocabulary with a Zipf distribution, where
+    the word of rank r occurs with a weight of 1 / r^exponent.
+
+    Input:
+    argument1: path(string)
+    argument2: vocabulary(list of strings), sorted from the most frequent rank
+    argument3: tokens(int), number of tokens written
+    argument4: exponent(optional)(float)
+    argument5: seed(optional)(int)
+    argument6: line_length(optional)(int), tokens per line
+
+    Ouput:  None
+
+    Time Complexity:    O(T log W), where T is the number of tokens and W is the size
+                        of vocabulary
+    -Analysis:  Each token is drawn by binary search over the cumulative weights.
+
+    Auxiliary space Complexity:   O(W + B), where B is the size of a batch of tokens
+
+    Space Complexity: O(W)(Input) + O(W + B)
+    """
+    generator = random.Random(seed)
+    weights = list(accumulate(1 / rank ** exponent for rank in range(1, len(vocabulary) + 1)))
+    batch = 1 << 16
+
+    with open(path, "w", encoding = "utf-8") as file:
+        written = 0
+        while written < tokens:
+            count = min(batch, tokens - written)
+            sample = generator.choices(vocabulary, cum_weights = weights, k = count)
+            lines = (" ".join(sample[i:i + line_length]) for i in range(0, count, line_length))
+            file.write("\n".join(lines))
+            file.write("\n")
+            written += count
+
+
+def make_queries(trie, vocabulary, count, seed = 0):
+    """
+    Function description:
+    Return three lists of keys, classified by how far search walks down the Trie:
+    1. hit:     the whole key is a path of the Trie, and it is not a word, so check
+                returns suggestions
+    2. miss:    the key leaves the Trie after its third character
+    3. early:   the key leaves the Trie at its first or second character
+    The keys are prefixes of random words, with one character replaced. The early keys
+    use a character outside of the alphabet, since a large vocabulary uses every
+    short prefix.
+
+    Input:
+    argument1: trie(Trie)
+    argument2: vocabulary(list of strings)
+    argument3: count(int), number of keys of each kind
+    argument4: seed(optional)(int)
+
+    Ouput:  queries(dict of string to list of strings)
+
+    Time Complexity:    O(A * L), where A is the number of attempts and L is the
+                        maximum length of word
+
+    Auxiliary space Complexity:   O(count * L)
+
+    Space Complexity: O(W)(Input) + O(count * L)
+    """
+    generator = random.Random(seed)
+    alphabet = sorted(set("".join(vocabulary[:1000])))
+    outside = next(chr(code) for code in range(ord("0"), 0x10000) 
+                   if chr(code).isalnum() and chr(code) not in alphabet)
+    queries = {"hit": [], "miss": [], "early": []}
+
+    for _ in range(count * 50):
+        if(all(len(keys) >= count for keys in queries.values())):
+            break
+
+        word = generator.choice(vocabulary)
+        kind = generator.choice(("hit", "miss", "early"))
+        if(kind == "hit"):
+            key = word[:generator.randint(1, len(word))]
+        else:
+            #Replacing a character, early in the key or later in the key
+            position = generator.randint(0, 1) if kind == "early" else generator.randint(3, len(word) + 2)
+            char = outside if kind == "early" else generator.choice(alphabet)
+            key = word[:position] + char + word[position + 1:]
+
+        path = trie.walk(key)
+        if(len(path) == len(key)):
+            kind = "hit" if path[-1].string is None else None
+        else:
+            kind = "early" if len(path) < 2 else "miss"
+
+        if(kind is not None and len(queries[kind]) < count):
+            queries[kind].append(key)
+
+    return queries
+
+
+def time_calls(function, keys):
+    """
+    Function description:
+    Call the function with every key, and return the percentiles and the mean of the
+    latency of one call in microseconds.
+
+    Input:
+    argument1: function(callable)
+    argument2: keys(list of strings)
+
+    Ouput:  latency(dict of string to float)
+
+    Time Complexity:    O(K * F), where K is the number of keys and F is the time of a call
+
+    Auxiliary space Complexity:   O(K)
+
+    Space Complexity: O(K)(Input) + O(K)
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    for key in keys:
+        start = clock()
+        function(key)
+        samples.append(clock() - start)
+
+    latency = {point: value / 1000 for point, value in percentiles(samples).items()}
+    latency["mean"] = sum(samples) / len(samples) / 1000 if samples else 0
+    latency["keys"] = len(samples)
+    return latency
+
+
+def measure_build(corpus, k):
+    """
+    Function description:
+    Build a SpellChecker from the corpus and measure it, this runs in a child process
+    so the peak RSS only belongs to one build:
+    1. seconds of SpellChecker construction
+    2. peak RSS of the process, and of the process before the build
+    3. bytes allocated by the Trie, traced by tracemalloc in a second build from the
+       same frequency table, divided by the number of distinct words
+
+    Input:
+    argument1: corpus(string), path of the corpus
+    argument2: k(int)
+
+    Ouput:  result(dict)
+
+    Time Complexity:    O(T), where T is the number of characters of the corpus
+
+    Auxiliary space Complexity:   O(T)
+
+    Space Complexity: O(1)(Input) + O(T)
+    """
+    #ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+
+    start = time.perf_counter()
+    checker = SpellChecker(corpus, k = k)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    del checker
+
+    counts = count_tokens(corpus)
+    tracemalloc.start()
+    trie = Trie.from_counts(counts, k = k)
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = 0
+    stack = [trie.root]
+    while stack:
+        current = stack.pop()
+        nodes += 1
+        stack.extend(current.link or [])
+
+    return {
+        "seconds": seconds,
+        "peak_rss_bytes": peak,
+        "baseline_rss_bytes": before,
+        "unique_words": len(counts),
+        "tokens": sum(counts.values()),
+        "nodes": nodes,
+        "trie_bytes": traced,
+        "bytes_per_word": traced / len(counts) if counts else 0,
+    }
+
+
+def revision():
+    """
+    Function description: Return the git commit of the working tree, or None outside of git.
+
+    Input:  None
+
+    Ouput:  commit(string) or None
+
+    Time Complexity:    O(1)
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(1)
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output = True, text = True,
+                                cwd = os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run(args):
+    """
+    Function description:
+    Run the whole benchmark: write the corpus, measure the build in a child process,
+    then build the SpellChecker here and time check for every kind of key.
+
+    Input:  args(argparse.Namespace)
+
+    Ouput:  report(dict)
+
+    Time Complexity:    O(T + Q), where T is the number of tokens and Q is the
+                        number of queries
+
+    Auxiliary space Complexity:   O(T)
+
+    Space Complexity: O(1)(Input) + O(T)
+    """
+    vocabulary = make_vocabulary(args.words, args.alphabet, args.seed, args.min_length, args.max_length)
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, "corpus.txt")
+        write_corpus(corpus, vocabulary, args.tokens, args.zipf, args.seed)
+        corpus_bytes = os.path.getsize(corpus)
+
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure-build", corpus, "--k", str(args.k)],
+                               capture_output = True, text = True, check = True)
+        build = json.loads(child.stdout)
+
+        checker = SpellChecker(corpus, k = args.k)
+
+    queries = make_queries(checker.trie, vocabulary, args.queries, args.seed)
+    #Warming up the interpreter and the caches of the processor
+    for keys in queries.values():
+        checker.check_many(keys)
+
+    return {
+        "revision": revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "words": args.words,
+            "tokens": args.tokens,
+            "alphabet": args.alphabet,
+            "zipf": args.zipf,
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+            "k": args.k,
+            "queries": args.queries,
+            "seed": args.seed,
+            "corpus_bytes": corpus_bytes,
+        },
+        "build": build,
+        "check_latency_us": {kind: time_calls(checker.check, keys) for kind, keys in queries.items()},
+    }
+
+
+def main(argv = None):
+    """
+    Function description: Parse the command line, run the benchmark and write the report as JSON.
+
+    Input:  argv(optional)(list of strings)
+
+    Ouput:  None
+
+    Time Complexity:    Same as run
+
+    Auxiliary space Complexity:   Same as run
+
+    Space Complexity: O(1)(Input) + Same as run
+    """
+    parser = argparse.ArgumentParser(description = "Benchmark SpellChecker on a synthetic Zipf corpus.")
+    parser.add_argument("--words", type = int, default = 50000, help = "distinct words of the corpus")
+    parser.add_argument("--tokens", type = int, default = 1000000, help = "tokens of the corpus")
+    parser.add_argument("--alphabet", default = "abcdefghijklmnopqrstuvwxyz")
+    parser.add_argument("--zipf", type = float, default = 1.1, help = "exponent of the Zipf distribution")
+    parser.add_argument("--min-length", type = int, default = 2)
+    parser.add_argument("--max-length", type = int, default = 12)
+    parser.add_argument("--k", type = int, default = 3)
+    parser.add_argument("--queries", type = int, default = 20000, help = "keys of each kind")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--output", help = "file of the JSON report, standard output by default")
+    parser.add_argument("--measure-build", metavar = "CORPUS", help = argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if(args.measure_build is not None):
+        print(json.dumps(measure_build(args.measure_build, args.k)))
+        return
+
+    report = json.dumps(run(args), indent = 2)
+    if(args.output is None):
+        print(report)
+    else:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import json
+import random
+import resource
+import time
+
+from Autocorrect import count_tokens
+from server import percentiles
+
+
+def make_keys(words, count, seed = 0):
+    """
+    Function description:
+    Return count random keys for the load, the prefixes of random words, with some
+    typos so that part of the keys leave the Trie early.
+
+    Input:
+    argument1: words(list of strings)
+    argument2: count(int)
+    argument3: seed(optional)(int)
+
+    Ouput:  keys(list of strings)
+
+    Time Complexity:    O(count * L), where L is the maximum length of word
+
+    Auxiliary space Complexity:   O(count * L)
+
+    Space Complexity: O(W)(Input) + O(count * L), where W is the size of words
+    """
+    generator = random.Random(seed)
+    keys = []
+    for _ in range(count):
+        word = generator.choice(words)
+        key = word[:generator.randint(1, len(word))]
+        #One key in ten has a wrong character
+        if(generator.random() < 0.1):
+            position = generator.randrange(len(key))
+            key = key[:position] + generator.choice("abcdefghijklmnopqrstuvwxyz") + key[position + 1:]
+        keys.append(key)
+    return keys
+
+
+async def client(host, port, keys, op, latencies, opened, start_event):
+    """
+    Function description:
+    Open one connection, wait for the start, then send the keys one by one, waiting
+    for each answer, and record the latency of every request.
+
+    Input:
+    argument1: host(string)
+    argument2: port(int)
+    argument3: keys(list of strings)
+    argument4: op(string), "check" or "prefix"
+    argument5: latencies(list of floats), receives the latencies in seconds
+    argument6: opened(list), receives one item when the connection is open
+    argument7: start_event(asyncio.Event)
+
+    Ouput:  None
+
+    Time Complexity:    O(R), where R is the number of keys
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(R)(Input) + O(1)
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit = 1 << 16)
+    opened.append(True)
+    await start_event.wait()
+    for number, key in enumerate(keys):
+        start = time.perf_counter()
+        writer.write(json.dumps({"id": number, "op": op, "key": key}).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if("error" in response):
+            raise RuntimeError(response["error"])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def request(host, port, op):
+    """
+    Function description: Send a single request without a key, such as stats, and return the result.
+
+    Input:
+    argument1: host(string)
+    argument2: port(int)
+    argument3: op(string)
+
+    Ouput:  result
+
+    Time Complexity:    O(1)
+
+    Auxiliary space Complexity:   O(1)
+
+    Space Complexity: O(1)(Input) + O(1)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"id": 0, "op": op}).encode("utf-8") + b"\n")
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return response["result"]
+
+
+async def run(host, port, words, connections, requests, op):
+    """
+    Function description:
+    Open all connections first, then start them together, and return the report of
+    the throughput and the latency percentiles seen by the clients and by the server.
+
+    Input:
+    argument1: host(string)
+    argument2: port(int)
+    argument3: words(list of strings)
+    argument4: connections(int)
+    argument5: requests(int), requests sent by each connection
+    argument6: op(string)
+
+    Ouput:  report(dict)
+
+    Time Complexity:    O(C * R), where C is the number of connections and R is the
+                        number of requests of each connection
+
+    Auxiliary space Complexity:   O(C * R)
+    -Analysis:  The keys and the latencies of every request are kept.
+
+    Space Complexity: O(W)(Input) + O(C * R)
+    """
+    latencies = []
+    opened = []
+    start_event = asyncio.Event()
+    tasks = [asyncio.create_task(client(host, port, make_keys(words, requests, seed), op, latencies, opened, start_event))
+             for seed in range(connections)]
+
+    #Waiting until every connection is open, a connection that fails stops the load
+    while len(opened) < connections:
+        failed = [task for task in tasks if task.done()]
+        if(failed):
+            start_event.set()
+            await asyncio.gather(*tasks)
+        await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    start_event.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "client_latency_ms": {point: value * 1000 for point, value in percentiles(latencies).items()},
+        "server": await request(host, port, "stats"),
+    }
+
+
+def main(argv = None):
+    """
+    Function description: Parse the command line, run the load against a running server
+    and print the report as JSON.
+
+    Input:  argv(optional)(list of strings)
+
+    Ouput:  None
+
+    Time Complexity:    O(T + C * R), where T is the number of characters of the corpus
+
+    Auxiliary space Complexity:   O(T + C * R)
+
+    Space Complexity: O(1)(Input) + O(T + C * R)
+    """
+    parser = argparse.ArgumentParser(description = "Send concurrent requests to server.py on localhost.")
+    parser.add_argument("corpus", help = "text file, its most common words are used to make the keys")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--connections", type = int, default = 2000)
+    parser.add_argument("--requests", type = int, default = 50, help = "requests sent by each connection")
+    parser.add_argument("--op", choices = ("check", "prefix"), default = "check")
+    parser.add_argument("--words", type = int, default = 10000, help = "number of common words used")
+    args = parser.parse_args(argv)
+
+    #Every connection takes a file descriptor
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = args.connections + 64
+    if(soft < wanted and (hard == resource.RLIM_INFINITY or soft < hard)):
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted if hard == resource.RLIM_INFINITY else min(wanted, hard), hard))
+
+    words = [word for word, _ in count_tokens(args.corpus).most_common(args.words)]
+    report = asyncio.run(run(args.host, args.port, words, args.connections, args.requests, args.op))
+    print(json.dumps(report, indent = 2))
+
+
+if __name__ == "__main__":
+    main()
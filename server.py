@@ -0,0 +1,424 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+from Autocorrect import ShardedSpellChecker, SpellChecker
+
+
+def percentiles(samples, points = (50, 90, 99, 99.9)):
+    """
+    Function description:
+    Return the percentiles of the samples by the nearest rank method, as a dictionary
+    that maps "p50", "p90", ... to the value.
+
+    Input:
+    argument1: samples(iterable of numbers)
+    argument2: points(optional)(tuple of numbers), the percentiles to report
+
+    Ouput:  percentiles(dict of string to number), empty if there are no samples
+
+    Time Complexity:    O(S log S), where S is the number of samples
+    -Analysis:  The samples are sorted once.
+
+    Auxiliary space Complexity:   O(S)
+
+    Space Complexity: O(S)(Input) + O(S)
+    """
+    ordered = sorted(samples)
+    if(len(ordered) == 0):
+        return {}
+
+    result = {}
+    for point in points:
+        #Nearest rank, the smallest sample that is not below point percent of the samples
+        rank = max(1, -(-len(ordered) * point // 100))
+        result["p%g" % point] = ordered[int(rank) - 1]
+    return result
+
+
+class AutocompleteServer:
+    """
+    Class for a local server that shares one SpellChecker between all clients.
+
+    The protocol is newline-delimited JSON over TCP. Every request is one line with an
+    object {"id": any, "op": "check" | "prefix" | "stats", "key": string}, and the server
+    answers every request with one line {"id": any, "result": ...} or
+    {"id": any, "error": string}, in the order of the requests of the connection.
+
+    The requests that arrive within window seconds are answered by one batched lookup,
+    so keys that share prefixes share the walks of search_many.
+    """
+    def __init__(self, checker, window = 0.002, max_batch = 1024, samples = 100000):
+        """
+        Function description: Constructor of AutocompleteServer class
+
+        Input:
+        argument1: checker(SpellChecker or ShardedSpellChecker)
+        argument2: window(optional)(float), seconds that a batch waits for more requests
+        argument3: max_batch(optional)(int), a full batch is looked up without waiting
+        argument4: samples(optional)(int), number of latest latencies kept for stats
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        self.checker = checker
+        self.window = window
+        self.max_batch = max_batch
+
+        #Requests waiting for the next batch, (op, key, future, arrival time)
+        self.pending = []
+        self.timer = None
+
+        #Latencies in seconds from reading the request to answering it
+        self.latencies = deque(maxlen = samples)
+        self.requests = 0
+        self.batches = 0
+
+
+    async def start(self, host = "127.0.0.1", port = 8765):
+        """
+        Function description: Start listening, and return the asyncio server.
+
+        Input:
+        argument1: host(optional)(string)
+        argument2: port(optional)(int), 0 picks a free port
+
+        Ouput:  server(asyncio.Server)
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        return await asyncio.start_server(self.handle, host, port, limit = 1 << 16, backlog = 4096)
+
+
+    async def handle(self, reader, writer):
+        """
+        Function description:
+        Serve one connection. Each line is parsed and submitted to the batch, and the
+        answer is written before the next line is read. A line longer than the limit
+        of the reader is skipped and answered with an error.
+
+        Input:
+        argument1: reader(asyncio.StreamReader)
+        argument2: writer(asyncio.StreamWriter)
+
+        Ouput:  None
+
+        Time Complexity:    O(R), where R is the number of requests of the connection
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        try:
+            while True:
+                line = await self.read_line(reader)
+                if(line == b""):
+                    break
+                if(line is None):
+                    response = {"id": None, "error": "request line too long"}
+                else:
+                    response = await self.answer(line)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+    async def read_line(self, reader):
+        """
+        Function description:
+        Read one request line. Unlike readline of the reader, a line longer than the 
+        limit is read to its end in pieces and dropped, so the next line is still a
+        whole request.
+
+        Input:  reader(asyncio.StreamReader)
+
+        Ouput:  line(bytes), b"" at the end of the stream, or None if the line is too long
+
+        Time Complexity:    O(M), where M is the length of the line
+
+        Auxiliary space Complexity:   O(L), where L is the limit of the reader
+
+        Space Complexity: O(1)(Input) + O(L)
+        """
+        too_long = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as error:
+                #The last line of the stream has no newline
+                line = error.partial
+            except asyncio.LimitOverrunError as error:
+                #Dropping the piece that is already buffered, the limit is kept
+                await reader.readexactly(error.consumed)
+                too_long = True
+                continue
+            return None if too_long else line
+
+
+    async def answer(self, line):
+        """
+        Function description:
+        Return the response to one request line. The check and prefix requests wait
+        for their batch, the stats request is answered at once. If the lookup of the
+        batch failed, the response is an error.
+
+        Input:  line(bytes)
+
+        Ouput:  response(dict)
+
+        Time Complexity:    O(M + W), where M is the length of the line and W is the
+                            time the batch waits
+
+        Auxiliary space Complexity:   O(M)
+
+        Space Complexity: O(M)(Input) + O(M)
+        """
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            op = request.get("op", "check")
+            key = request.get("key", "")
+        except (ValueError, AttributeError):
+            return {"id": None, "error": "invalid request"}
+
+        if(op == "stats"):
+            return {"id": request.get("id"), "result": self.stats()}
+        if(op not in ("check", "prefix") or not isinstance(key, str)):
+            return {"id": request.get("id"), "error": "unknown op or key"}
+
+        future = asyncio.get_running_loop().create_future()
+        self.submit(op, key, future, start)
+        try:
+            return {"id": request.get("id"), "result": await future}
+        except Exception as error:
+            return {"id": request.get("id"), "error": "lookup failed: %s" % error}
+
+
+    def submit(self, op, key, future, start):
+        """
+        Function description:
+        Add a request to the pending batch. The first request of a batch starts the
+        timer of the window, and a full batch is flushed at once.
+
+        Input:
+        argument1: op(string)
+        argument2: key(string)
+        argument3: future(asyncio.Future), receives the result
+        argument4: start(float), the time the request was read
+
+        Ouput:  None
+
+        Time Complexity:    O(1), except when the batch is flushed
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        self.pending.append((op, key, future, start))
+        if(len(self.pending) >= self.max_batch):
+            self.flush()
+        elif(self.timer is None):
+            self.timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+
+    def flush(self):
+        """
+        Function description:
+        Look up the pending batch. The check requests are answered by one call of
+        check_many, the prefix requests by one call of complete_many, and the latency
+        of every request is recorded. If a lookup raises, its requests get the
+        exception, so no client waits forever for a batch that failed.
+
+        Input:  None
+
+        Ouput:  None
+
+        Time Complexity:    O(B log B * M), where B is the size of batch and M is the
+                            maximum length of key
+        -Analysis:  Same as check_many and complete_many.
+
+        Auxiliary space Complexity:   O(B)
+
+        Space Complexity: O(1)(Input) + O(B)
+        """
+        if(self.timer is not None):
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if(len(batch) == 0):
+            return
+
+        for op, lookup in (("check", self.checker.check_many), ("prefix", self.checker.complete_many)):
+            requests = [request for request in batch if request[0] == op]
+            if(len(requests) == 0):
+                continue
+            try:
+                results = lookup([request[1] for request in requests])
+            except Exception as error:
+                for request in requests:
+                    self.reject(request, error)
+                continue
+            for request, result in zip(requests, results):
+                self.resolve(request, result)
+
+        self.batches += 1
+
+
+    def resolve(self, request, result):
+        """
+        Function description: Give the result to the waiting request and record its latency.
+
+        Input:
+        argument1: request(tuple), (op, key, future, start)
+        argument2: result(list of strings)
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        future = request[2]
+        #The client may be gone already
+        if(not future.done()):
+            future.set_result(result)
+        self.latencies.append(time.perf_counter() - request[3])
+        self.requests += 1
+
+
+    def reject(self, request, error):
+        """
+        Function description: Give the exception of a failed lookup to the waiting request.
+
+        Input:
+        argument1: request(tuple), (op, key, future, start)
+        argument2: error(Exception)
+
+        Ouput:  None
+
+        Time Complexity:    O(1)
+
+        Auxiliary space Complexity:   O(1)
+
+        Space Complexity: O(1)(Input) + O(1)
+        """
+        future = request[2]
+        if(not future.done()):
+            future.set_exception(error)
+        self.requests += 1
+
+
+    def stats(self):
+        """
+        Function description:
+        Return the number of requests and batches, the mean batch size, and the
+        percentiles of the latest latencies in milliseconds.
+
+        Input:  None
+
+        Ouput:  stats(dict)
+
+        Time Complexity:    O(S log S), where S is the number of latencies kept
+
+        Auxiliary space Complexity:   O(S)
+
+        Space Complexity: O(1)(Input) + O(S)
+        """
+        latency = percentiles(self.latencies)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0,
+            "latency_ms": {point: value * 1000 for point, value in latency.items()},
+        }
+
+
+async def serve(checker, host, port, window, max_batch):
+    """
+    Function description: Run the server until it is cancelled.
+
+    Input:
+    argument1: checker(SpellChecker or ShardedSpellChecker)
+    argument2: host(string)
+    argument3: port(int)
+    argument4: window(float), seconds
+    argument5: max_batch(int)
+
+    Ouput:  None
+
+    Time Complexity:    O(1) per request, besides the lookups
+
+    Auxiliary space Complexity:   O(C), where C is the number of connections
+
+    Space Complexity: O(1)(Input) + O(C)
+    """
+    server = AutocompleteServer(checker, window, max_batch)
+    listener = await server.start(host, port)
+    print("listening on %s:%d" % listener.sockets[0].getsockname()[:2], flush = True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv = None):
+    """
+    Function description: Parse the command line, load the SpellChecker and serve it.
+
+    Input:  argv(optional)(list of strings)
+
+    Ouput:  None
+
+    Time Complexity:    O(T) for loading, where T is the number of characters of the corpus
+
+    Auxiliary space Complexity:   O(T)
+
+    Space Complexity: O(1)(Input) + O(T)
+    """
+    parser = argparse.ArgumentParser(description = "Serve a SpellChecker with newline-delimited JSON over TCP.")
+    source = parser.add_mutually_exclusive_group(required = True)
+    source.add_argument("--corpus", nargs = "+", help = "text files to count")
+    source.add_argument("--snapshot", help = "snapshot file written by SpellChecker.save")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--window", type = float, default = 2.0, help = "batch window in milliseconds")
+    parser.add_argument("--max-batch", type = int, default = 1024)
+    parser.add_argument("--k", type = int, default = 3)
+    parser.add_argument("--shards", type = int, help = "split the words across this many processes")
+    args = parser.parse_args(argv)
+
+    if(args.shards is not None and args.snapshot is not None):
+        parser.error("--shards can only be used with --corpus")
+
+    if(args.snapshot is not None):
+        checker = SpellChecker.load(args.snapshot)
+    elif(args.shards is not None):
+        checker = ShardedSpellChecker.from_files(args.corpus, k = args.k, shards = args.shards)
+    else:
+        checker = SpellChecker.from_files(args.corpus, k = args.k)
+
+    try:
+        asyncio.run(serve(checker, args.host, args.port, args.window / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if(args.shards is not None):
+            checker.close()
+
+
+if __name__ == "__main__":
+    main()
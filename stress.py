@@ -0,0 +1,256 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from Autocorrect import Trie, rank_key
+
+
+def make_words(words, keys, seed = 0, alphabet = "abcdefgh"):
+    """
+    Function description:
+    Return a random frequency table and random search keys. The alphabet is small, so
+    the words share most of their prefixes and every write changes rankings that the
+    readers use.
+
+    Input:
+    argument1: words(int), number of random words
+    argument2: keys(int), number of random keys
+    argument3: seed(optional)(int)
+    argument4: alphabet(optional)(string)
+
+    Ouput:  (counts(dict of string to int), keys(list of strings))
+
+    Time Complexity:    O(W + K), where W is words and K is keys
+
+    Auxiliary space Complexity:   O(W + K)
+
+    Space Complexity: O(1)(Input) + O(W + K)
+    """
+    generator = random.Random(seed)
+    counts = {}
+    for _ in range(words):
+        word = "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 7)))
+        counts[word] = generator.randint(1, 50)
+    queries = ["".join(generator.choice(alphabet) for _ in range(generator.randint(1, 5))) for _ in range(keys)]
+    return counts, queries
+
+
+def check_version(trie, root, key, result):
+    """
+    Function description:
+    Check the invariants that a reader relies on, for the version of the Trie that
+    starts at root. It is called after the threads stopped, so every later write had 
+    its chance to change the version:
+    1. the version never changes, so searching key again gives the same result
+    2. every ranking on the path is sorted by rank_key and has no duplicate words
+    3. every ranked word is still a word of the version, so no removed word is suggested
+
+    Input:
+    argument1: trie(Trie)
+    argument2: root(Node), the version read by the reader
+    argument3: key(string)
+    argument4: result(list of strings), the result of key in this version
+
+    Ouput:  errors(list of tuples)
+
+    Time Complexity:    O(n * k * L), where n is the length of key and L is the
+                        maximum length of word
+
+    Auxiliary space Complexity:   O(n * k)
+
+    Space Complexity: O(n)(Input) + O(n * k)
+    """
+    errors = []
+    path = trie.walk(key, root)
+    if(trie.collect(path, key, root) != result):
+        errors.append(("changed", key))
+
+    for current in path:
+        ranking = current.ranking or []
+        keys = [rank_key(node) for node in ranking]
+        if(keys != sorted(set(keys)) or len(set(node.string for node in ranking)) != len(ranking)):
+            errors.append(("unsorted", key))
+        for node in ranking:
+            word = trie.walk(node.string or "", root)
+            if(node.string is None or len(word) != len(node.string) or word[-1].string != node.string):
+                errors.append(("removed", key, node.string))
+
+    return errors
+
+
+def run(mode, counts, keys, readers = 8, seconds = 3.0, seed = 1, writes = 1000, samples = 500):
+    """
+    Function description:
+    Search random keys from many reader threads while one writer thread adjusts random
+    words at a fixed rate, and return the throughput and the errors found. The modes are:
+    1. "cow": Trie(concurrent = True), the readers never take a lock
+    2. "lock": a default Trie, and one global lock around every search and adjust
+
+    Both modes run the same reader loop and the same paced writer, so the read 
+    throughput only measures the scheme. Every 50th search of a reader is sampled, 
+    and in "cow" mode the samples are checked by check_version after the threads 
+    stopped, outside of the timed loop. The writes_per_second of the report shows
+    whether the writer kept its rate. After that, every key is searched again and 
+    compared with a Trie that is built from the final frequencies.
+
+    Input:
+    argument1: mode(string), "cow" or "lock"
+    argument2: counts(dict of string to int), the first frequencies
+    argument3: keys(list of strings)
+    argument4: readers(optional)(int), number of reader threads
+    argument5: seconds(optional)(float)
+    argument6: seed(optional)(int), seed of the writer
+    argument7: writes(optional)(int), writes per second of the writer
+    argument8: samples(optional)(int), maximum number of samples kept by a reader
+
+    Ouput:  report(dict)
+
+    Time Complexity:    O(seconds) + O(K * n + R * S * n * k * L), where K is the number
+                        of keys, R is readers and S is samples
+    -Analysis:  Same as check_version for every sample.
+
+    Auxiliary space Complexity:   O(W + R * S * n), where W is the number of words
+    -Analysis:  A sample keeps its version, which shares all nodes but the copied 
+                paths with the other versions.
+
+    Space Complexity: O(W + K)(Input) + O(W + R * S * n)
+    """
+    trie = Trie.from_counts(counts, concurrent = (mode == "cow"))
+    lock = threading.Lock()
+    stop = threading.Event()
+    expected = dict(counts)
+    words = sorted(counts)
+    reads = [0] * readers
+    written = [0]
+    sampled = [[] for _ in range(readers)]
+    errors = []
+
+    def writer():
+        generator = random.Random(seed)
+        start = time.perf_counter()
+        while not stop.is_set():
+            #Pacing the writer, the next write is due at start + written / writes
+            delay = start + written[0] / writes - time.perf_counter()
+            if(delay > 0):
+                time.sleep(delay)
+                continue
+            word = generator.choice(words)
+            delta = generator.choice((1, 2, -1, -3))
+            if(expected.get(word, 0) == 0):
+                delta = 1
+            #A word whose frequency would reach zero is removed
+            if(expected.get(word, 0) + delta <= 0):
+                if(mode == "lock"):
+                    with lock:
+                        trie.remove(word)
+                else:
+                    trie.remove(word)
+                del expected[word]
+            else:
+                if(mode == "lock"):
+                    with lock:
+                        trie.adjust(word, delta)
+                else:
+                    trie.adjust(word, delta)
+                expected[word] = expected.get(word, 0) + delta
+            written[0] += 1
+
+    def reader(number):
+        generator = random.Random(seed + 1 + number)
+        kept = sampled[number]
+        count = 0
+        while not stop.is_set():
+            key = generator.choice(keys)
+            if(mode == "lock"):
+                with lock:
+                    root = trie.root
+                    result = trie.collect(trie.walk(key, root), key, root)
+            else:
+                #The root is read once, same as search
+                root = trie.root
+                result = trie.collect(trie.walk(key, root), key, root)
+            if(count % 50 == 0):
+                #Reservoir sampling, so the samples cover the whole run
+                index = count // 50
+                if(index < samples):
+                    kept.append((root, key, result))
+                else:
+                    index = generator.randrange(index + 1)
+                    if(index < samples):
+                        kept[index] = (root, key, result)
+            count += 1
+        reads[number] = count
+
+    threads = [threading.Thread(target = reader, args = (number,)) for number in range(readers)]
+    threads.append(threading.Thread(target = writer))
+    #The readers never wait in "cow" mode, so with the default interval of 5 ms the
+    #sleeping writer gets the GIL back too late to keep its rate
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(0.001)
+    try:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        #The sleep may end late when the threads hold the GIL
+        elapsed = time.perf_counter() - start
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    #The versions of the lock mode are changed in place, so they are not checked
+    for root, key, result in (sample for kept in sampled for sample in kept):
+        if(len(set(result)) != len(result)):
+            errors.append(("duplicate", key))
+        if(mode == "cow"):
+            errors.extend(check_version(trie, root, key, result))
+
+    rebuilt = Trie.from_counts(expected)
+    return {
+        "mode": mode,
+        "reads_per_second": sum(reads) / elapsed,
+        "writes_per_second": written[0] / elapsed,
+        "errors": errors[:20],
+        "error_count": len(errors),
+        "final_mismatches": sum(trie.search(key) != rebuilt.search(key) for key in keys),
+    }
+
+
+def main(argv = None):
+    """
+    Function description: Parse the command line, run the stress test in both modes,
+    and print the reports as JSON. The exit status is 1 if any error was found.
+
+    Input:  argv(optional)(list of strings)
+
+    Ouput:  None
+
+    Time Complexity:    Same as run
+
+    Auxiliary space Complexity:   Same as run
+
+    Space Complexity: O(1)(Input) + Same as run
+    """
+    parser = argparse.ArgumentParser(description = "Stress the concurrent Trie with many readers and one writer.")
+    parser.add_argument("--readers", type = int, default = 8)
+    parser.add_argument("--seconds", type = float, default = 3.0, help = "duration of each mode")
+    parser.add_argument("--words", type = int, default = 5000)
+    parser.add_argument("--keys", type = int, default = 2000)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--writes", type = int, default = 1000, help = "writes per second of the writer")
+    args = parser.parse_args(argv)
+
+    counts, keys = make_words(args.words, args.keys, args.seed)
+    reports = [run(mode, counts, keys, args.readers, args.seconds, args.seed + 1, args.writes) for mode in ("cow", "lock")]
+    print(json.dumps(reports, indent = 2))
+    if(any(report["error_count"] or report["final_mismatches"] for report in reports)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
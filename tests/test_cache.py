@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from Autocorrect import KeyIndex, Trie
+
+
+def random_word(generator, alphabet = "abcd", longest = 5):
+    return "".join(generator.choice(alphabet) for _ in range(generator.randint(1, longest)))
+
+
+def test_key_index_matches_a_set():
+    generator = random.Random(0)
+    index = KeyIndex()
+    index.LOAD = 4
+    keys = set()
+    for _ in range(5000):
+        key = random_word(generator)
+        action = generator.random()
+        if(action < 0.5 and key not in keys):
+            index.add(key)
+            keys.add(key)
+        elif(action < 0.8):
+            index.discard(key)
+            keys.discard(key)
+        else:
+            prefix = key[:generator.randint(1, 2)]
+            expected = sorted(word for word in keys if word.startswith(prefix))
+            assert index.pop_prefix(prefix) == expected
+            keys.difference_update(expected)
+        assert [key for chunk in index.chunks for key in chunk] == sorted(keys)
+        assert index.maxes == [chunk[-1] for chunk in index.chunks]
+
+
+def test_cached_results_are_never_stale():
+    for seed in range(20):
+        generator = random.Random(seed)
+        options = generator.choice([{}, {"lazy": True}, {"ranking_depth": 1}])
+        cached = Trie(k = generator.randint(1, 3), cache_size = generator.randint(1, 30), **options)
+        plain = Trie(k = cached.k)
+        for _ in range(400):
+            key = random_word(generator)
+            action = generator.random()
+            if(action < 0.3):
+                cached.insert(key)
+                plain.insert(key)
+            elif(action < 0.4 and plain.frequency(key) > 0):
+                cached.remove(key)
+                plain.remove(key)
+            else:
+                assert cached.search(key) == plain.search(key)
+        assert len(cached.cache) <= cached.cache_size
+        assert [key for chunk in cached.cached_keys.chunks for key in chunk] == sorted(cached.cache)
+
+
+def test_concurrent_ranking_depth_reports_the_mode_conflict():
+    with pytest.raises(ValueError, match = "lazy mode"):
+        Trie(concurrent = True, ranking_depth = 1)
+    with pytest.raises(ValueError, match = "search cache"):
+        Trie(concurrent = True, cache_size = 10)
+    assert Trie(ranking_depth = 1).cache_size > 0
+    assert Trie(ranking_depth = 1, cache_size = 0).cache is None
@@ -0,0 +1,15 @@
+import stress
+
+
+def test_readers_see_consistent_versions():
+    counts, keys = stress.make_words(2000, 500)
+    report = stress.run("cow", counts, keys, readers = 4, seconds = 0.5)
+    assert report["error_count"] == 0, report["errors"]
+    assert report["final_mismatches"] == 0
+
+
+def test_global_lock_mode():
+    counts, keys = stress.make_words(2000, 500)
+    report = stress.run("lock", counts, keys, readers = 2, seconds = 0.2)
+    assert report["error_count"] == 0, report["errors"]
+    assert report["final_mismatches"] == 0
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from Autocorrect import RadixTrie, SpellChecker, Trie
+
+
+def distance(first, second):
+    row = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        previous, row[0] = row[0], i
+        for j, letter in enumerate(second, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != letter))
+    return row[-1]
+
+
+def brute_force(counts, word, max_edits, k):
+    candidates = sorted((distance(key, word), -freq, key) for key, freq in counts.items())
+    return [key for edits, _, key in candidates if edits <= max_edits][:k]
+
+
+def test_correct_matches_brute_force(tmp_path):
+    for seed in range(30):
+        generator = random.Random(seed)
+        alphabet = generator.choice(["ab", "abc", "abcdé"])
+        counts = {}
+        for _ in range(generator.randint(0, 60)):
+            key = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 6)))
+            counts[key] = counts.get(key, 0) + generator.randint(1, 4)
+        k = generator.randint(1, 4)
+        trie = Trie.from_counts(counts, k = k)
+        path = tmp_path / ("%d.trie" % seed)
+        trie.save(path)
+        snapshot = Trie.load(path)
+
+        for _ in range(20):
+            word = "".join(generator.choice(alphabet + "z") for _ in range(generator.randint(0, 7)))
+            max_edits = generator.randint(0, 3)
+            #The search stops at the smallest distance that has k words
+            expected = None
+            for budget in range(max_edits + 1):
+                expected = brute_force(counts, word, budget, k)
+                if(len(expected) == k):
+                    break
+            assert trie.correct(word, max_edits) == expected
+            assert snapshot.correct(word, max_edits) == expected
+        snapshot.close()
+
+
+def test_negative_max_edits():
+    trie = Trie.from_counts({"word": 1})
+    with pytest.raises(ValueError):
+        trie.correct("word", -1)
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_k_below_one(k, tmp_path):
+    trie = Trie.from_counts({"word": 1, "ward": 2})
+    trie.save(tmp_path / "trie.bin")
+    snapshot = Trie.load(tmp_path / "trie.bin")
+    checkers = [trie, RadixTrie.from_counts({"word": 1}), snapshot, SpellChecker.from_counts({"word": 1})]
+    for checker in checkers:
+        with pytest.raises(ValueError):
+            checker.correct("wird", 2, k)
+    with pytest.raises(ValueError):
+        SpellChecker.from_counts({"word": 1}).correct(" ", 2, k)
+    snapshot.close()
@@ -0,0 +1,18 @@
+import random
+
+import pytest
+
+from Autocorrect import Trie
+
+numpy = pytest.importorskip("numpy")
+
+
+def test_lookup_batch_matches_search():
+    generator = random.Random(2)
+    counts = {"".join(generator.choice("abc") for _ in range(generator.randint(1, 6))): generator.randint(1, 9) for _ in range(300)}
+    trie = Trie.from_counts(counts, k = 3)
+    frozen = trie.freeze()
+    tokens = ["".join(generator.choice("abcd") for _ in range(generator.randint(0, 8))) for _ in range(2000)]
+    tokens += ["a" * 5000, "ab" + "c" * 4000, " "]
+    assert frozen.height == max(map(len, counts))
+    assert frozen.lookup_batch(tokens) == [trie.search(token) for token in tokens]
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from Autocorrect import Trie
+
+
+def test_fallbacks_of_a_chain_node():
+    counts = {"abcdef": 3, "abcxyz": 2}
+    eager = Trie.from_counts(counts, k = 1, instrument = True)
+    lean = Trie.from_counts(counts, k = 1, instrument = True, ranking_depth = 1)
+    eager.search("abcde")
+    lean.search("abcde")
+    assert lean.stats().get("fallbacks", 0) == eager.stats().get("fallbacks", 0) == 0
+
+
+@pytest.mark.parametrize("options", [{"lazy": True}, {"ranking_depth": 1}, {"ranking_depth": 2}])
+def test_fallbacks_match_the_eager_mode(options):
+    generator = random.Random(8)
+    counts = {"".join(generator.choice("abc") for _ in range(generator.randint(1, 7))): generator.randint(1, 9) for _ in range(150)}
+    keys = ["".join(generator.choice("abcd") for _ in range(generator.randint(1, 8))) for _ in range(500)]
+    eager = Trie.from_counts(counts, k = 2, instrument = True)
+    other = Trie.from_counts(counts, k = 2, instrument = True, cache_size = 0, **options)
+    for key in keys:
+        assert other.search(key) == eager.search(key)
+    assert other.stats().get("fallbacks", 0) == eager.stats().get("fallbacks", 0)
+    assert other.stats()["searches"] == eager.stats()["searches"]
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from Autocorrect import RadixTrie, SpellChecker, Trie
+
+
+@pytest.mark.parametrize("options", [{}, {"cache_size": 4}, {"instrument": True}])
+def test_radix_trie_matches_trie(options):
+    for seed in range(100):
+        generator = random.Random(seed)
+        alphabet = generator.choice(["ab", "abc", "aAb1"])
+        k = generator.choice([1, 2, 3, 5])
+        radix = RadixTrie(k = k, **options)
+        trie = Trie(k = k)
+        for _ in range(generator.randint(1, 120)):
+            word = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 5)))
+            action = generator.random()
+            if(action < 0.5):
+                delta = generator.randint(1, 3)
+            elif(action < 0.7 and trie.frequency(word) > 0):
+                delta = -generator.randint(1, 4)
+            elif(action < 0.8 and trie.frequency(word) > 0):
+                radix.remove(word)
+                trie.remove(word)
+                continue
+            else:
+                for key in (word, word[:2], word[:1] + "z"):
+                    assert radix.search(key) == trie.search(key)
+                    assert radix.complete(key) == trie.complete(key)
+                    assert radix.correct(key) == trie.correct(key)
+                continue
+            radix.adjust(word, delta)
+            trie.adjust(word, delta)
+
+        keys = ["".join(generator.choice(alphabet) for _ in range(generator.randint(0, 4))) for _ in range(20)]
+        assert radix.search_many(keys) == trie.search_many(keys)
+
+
+def test_radix_spell_checker_saves_and_removes(tmp_path):
+    checker = SpellChecker.from_counts({"hello": 5, "help": 3, "helmet": 2}, radix = True, cache_size = 10)
+    assert checker.check("hel") == ["hello", "help", "helmet"]
+    checker.save(tmp_path / "radix.bin")
+    assert SpellChecker.load(tmp_path / "radix.bin").check("hel") == ["hello", "help", "helmet"]
+    checker.trie.remove("hello")
+    assert checker.check("hel") == ["help", "helmet"]
+    with pytest.raises(ValueError):
+        RadixTrie(concurrent = True)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from Autocorrect import Trie
+
+
+def dump(trie):
+    """Every node of the Trie as (prefix, word, frequency, ranking), sorted by prefix."""
+    nodes = []
+    stack = [(trie.root, "")]
+    while stack:
+        current, prefix = stack.pop()
+        ranking = trie.get_ranking(current) or []
+        nodes.append((prefix, current.string, current.freq, [node.string for node in ranking]))
+        stack.extend((child, prefix + char) for char, child in zip(current.chars, current.link or []))
+    return sorted(nodes)
+
+
+@pytest.mark.parametrize("options", [{}, {"concurrent": True}, {"cache_size": 10}, {"lazy": True}, 
+                                     {"ranking_depth": 1}])
+def test_updates_match_a_rebuild(options):
+    for seed in range(150):
+        generator = random.Random(seed)
+        alphabet = generator.choice(["ab", "abc", "aAb1"])
+        k = generator.choice([1, 2, 3, 5])
+        trie = Trie(k = k, **options)
+        counts = {}
+        for _ in range(generator.randint(1, 120)):
+            word = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 4)))
+            action = generator.random()
+            if(action < 0.5):
+                delta = generator.randint(1, 3)
+                trie.adjust(word, delta)
+                counts[word] = counts.get(word, 0) + delta
+            elif(action < 0.75 and counts.get(word, 0) > 0):
+                delta = generator.randint(1, 4)
+                trie.adjust(word, -delta)
+                counts[word] -= delta
+                if(counts[word] <= 0):
+                    del counts[word]
+            elif(action < 0.85 and word in counts):
+                trie.remove(word)
+                del counts[word]
+            elif(action < 0.85):
+                with pytest.raises(KeyError):
+                    trie.remove(word)
+            else:
+                assert trie.search(word) == Trie.from_counts(counts, k = k).search(word)
+
+        rebuilt = Trie.from_counts(counts, k = k)
+        assert dump(trie) == dump(rebuilt)
+        assert trie.frequency(word) == counts.get(word, 0)
+
+
+def test_lazy_search_stops_at_a_full_result():
+    trie = Trie(k = 2, lazy = True)
+    for i in range(200):
+        trie.insert("q" + str(i))
+    trie.adjust("qqa", 5)
+    trie.adjust("qqb", 4)
+    assert trie.search("qqk") == ["qqa", "qqb"]
+    #The ranking of "q" is still dirty, since the result was full at "qq"
+    assert trie.walk("q")[0].ranking is None
+
+
+def test_long_chains_match_the_full_rankings():
+    counts = {"a" * 300: 3, "a" * 150 + "b": 2, "a" * 20: 1, "c": 4}
+    eager = Trie.from_counts(counts, k = 5)
+    lean = Trie.from_counts(counts, k = 5, ranking_depth = 1, cache_size = 0)
+    for key in ["a" * n + tail for n in (1, 19, 20, 21, 150, 151, 299) for tail in ("", "z", "b")]:
+        assert lean.search(key) == eager.search(key)
+        assert lean.complete(key) == eager.complete(key)
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import random
+
+from Autocorrect import SpellChecker, Trie
+from server import AutocompleteServer
+
+
+def test_complete_many_matches_complete():
+    generator = random.Random(5)
+    counts = {"".join(generator.choice("abcd") for _ in range(generator.randint(1, 6))): generator.randint(1, 20) for _ in range(800)}
+    keys = ["".join(generator.choice("abcde") for _ in range(generator.randint(0, 5))) for _ in range(500)]
+    keys += ["", " ", "a", "a"]
+
+    trie = Trie.from_counts(counts)
+    assert trie.complete_many(keys) == [trie.complete(key) for key in keys]
+
+    checker = SpellChecker.from_counts(counts)
+    assert checker.complete_many(keys) == [checker.complete(key) for key in keys]
+
+
+class FailingChecker:
+    def check_many(self, keys):
+        raise RuntimeError("broken shard")
+
+    def complete_many(self, keys):
+        return [[key] for key in keys]
+
+
+def exchange(checker, lines):
+    async def run():
+        server = AutocompleteServer(checker, window = 0.001)
+        listener = await server.start(port = 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for line in lines:
+            writer.write(line + b"\n")
+            await writer.drain()
+            answer = await asyncio.wait_for(reader.readline(), 5)
+            if(not answer):
+                break
+            responses.append(json.loads(answer))
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return responses
+
+    return asyncio.run(run())
+
+
+def test_failed_lookup_is_answered_with_an_error():
+    responses = exchange(FailingChecker(), [
+        json.dumps({"id": 1, "op": "check", "key": "ab"}).encode(),
+        json.dumps({"id": 2, "op": "prefix", "key": "ab"}).encode(),
+    ])
+    assert responses[0]["id"] == 1 and "broken shard" in responses[0]["error"]
+    assert responses[1] == {"id": 2, "result": ["ab"]}
+
+
+def test_long_line_is_answered_with_an_error():
+    checker = SpellChecker.from_counts({"hello": 3})
+    responses = exchange(checker, [b"x" * (1 << 17), json.dumps({"id": 1, "op": "check", "key": "he"}).encode()])
+    assert responses == [{"id": None, "error": "request line too long"}, {"id": 1, "result": ["hello"]}]
@@ -0,0 +1,25 @@
+import multiprocessing
+
+import pytest
+
+import Autocorrect
+from Autocorrect import ShardedSpellChecker
+
+
+def test_invalid_options_raise_before_spawning():
+    with pytest.raises(TypeError):
+        ShardedSpellChecker.from_counts({"word": 1}, shards = 2, unknown = 1)
+    assert multiprocessing.active_children() == []
+
+
+def test_shard_failure_stops_every_shard(monkeypatch):
+    if(multiprocessing.get_start_method() != "fork"):
+        pytest.skip("the patched Trie only reaches forked shards")
+
+    def broken(counts, **options):
+        raise RuntimeError("broken build")
+
+    monkeypatch.setattr(Autocorrect.Trie, "from_counts", staticmethod(broken))
+    with pytest.raises(RuntimeError, match = "broken build"):
+        ShardedSpellChecker.from_counts({"word": 1, "ward": 2, "other": 3}, shards = 3)
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,22 @@
+import random
+
+from Autocorrect import SpellChecker, Trie
+
+
+def test_loaded_checker_iterates_and_saves(tmp_path):
+    generator = random.Random(4)
+    counts = {"".join(generator.choice("abé") for _ in range(generator.randint(1, 5))): generator.randint(1, 5) for _ in range(200)}
+    checker = SpellChecker.from_counts(counts, k = 2)
+    checker.save(tmp_path / "first.bin")
+
+    loaded = SpellChecker.load(tmp_path / "first.bin")
+    for key in ["a", "ab", "é", "b", "zz"]:
+        for order in ("rank", "lex"):
+            assert list(loaded.iter_prefix(key, order)) == list(checker.iter_prefix(key, order))
+
+    loaded.save(tmp_path / "second.bin")
+    loaded.save(tmp_path / "first.bin")
+    copy = Trie.load(tmp_path / "second.bin")
+    assert list(copy.iter_prefix("a")) == list(checker.iter_prefix("a"))
+    assert loaded.check("ab") == checker.check("ab")
+    copy.close()
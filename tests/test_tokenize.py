@@ -0,0 +1,66 @@
+import io
+import os
+import subprocess
+import sys
+
+from collections import Counter
+
+from Autocorrect import (SpellChecker, count_tokens, count_tokens_range, parallel_count_tokens, split_file, 
+                         tokenize, tokenize_chunks)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEXT = "The quick brown fox, jumps over 12 lazy dogs.\n  café ½ naïve\tfox fox\n" * 50
+
+
+def test_strings_of_an_iterable_are_separate_pieces():
+    assert list(tokenize(["hello", "world"])) == ["hello", "world"]
+    assert SpellChecker(["hello", "world"]).trie.frequency("hello") == 1
+
+
+def test_chunks_are_joined():
+    assert list(tokenize_chunks(["hel", "lo wo", "rld"])) == ["hello", "world"]
+
+
+def test_tokens_spanning_buffers():
+    expected = count_tokens(TEXT.splitlines())
+    for chunk_size in (1, 2, 7, 64, 1 << 20):
+        assert count_tokens(io.StringIO(TEXT), chunk_size) == expected
+
+
+def test_numeric_characters_that_are_not_digits():
+    #'½' is numeric but not a digit, so it splits the token
+    assert list(tokenize(["a½b café x2y"])) == ["a", "b", "café", "x2y"]
+
+
+def test_leading_whitespace():
+    assert list(tokenize(["   indented line"])) == ["indented", "line"]
+
+
+def test_parallel_count(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text(TEXT * 20, encoding = "utf-8")
+    expected = count_tokens(str(path))
+    assert parallel_count_tokens(str(path), processes = 3) == expected
+
+    #The ranges are aligned to the delimiters, so the partial counts add up to the whole count
+    counts = Counter()
+    for start, end in split_file(str(path), 7):
+        counts.update(count_tokens_range(str(path), start, end, chunk_size = 100))
+    assert counts == expected
+
+
+def test_default_encoding_ignores_the_locale(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text("café naïve Ærø смысл 東京 café\n" * 30, encoding = "utf-8")
+    #An ascii locale, where open would fail on the corpus without an explicit encoding
+    environment = dict(os.environ, LC_ALL = "C", PYTHONCOERCECLOCALE = "0", PYTHONUTF8 = "0")
+    script = ("import sys; from Autocorrect import SpellChecker, count_tokens, parallel_count_tokens; "
+              "path, word = sys.argv[1], 'caf\\u00e9'; counts = count_tokens(path); "
+              "assert counts == parallel_count_tokens(path, processes = 2); "
+              "assert SpellChecker(path).trie.frequency(word) == SpellChecker.from_files(path).trie.frequency(word); "
+              "print(counts[word], len(counts))")
+    result = subprocess.run([sys.executable, "-c", script, str(path)], env = environment, cwd = ROOT, 
+                            capture_output = True, text = True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["60", "5"]